@@ -1,9 +1,35 @@
 import pandas as pd
 import numpy as np
 import warnings
+import hashlib
 from pprint import pprint
 from datetime import datetime
 
+try:
+    import python_calamine  # noqa: F401
+    # Rust-based reader, much faster than openpyxl for .xlsm workbooks
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Sheets consulted by the parsers, the rest of the workbook is never read
+REQUIRED_SHEETS = ['Общая таблица', 'Команды', 'Числа', 'Преферанс', 'Разоблачение', 'Аукцион', 'Момент истины']
+# Sheets whose column names are in the second row instead of the first one
+SHEET_HEADER_ROWS = {'Числа': 1, 'Разоблачение': 1}
+
+def file_sha256(file_path):
+    """
+    Calculate SHA-256 of a file's contents.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    with open(file_path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
 class XLSParseError(Exception):
     def __init__(self, message):
         super().__init__(message)
@@ -27,6 +53,8 @@ class BdGame:
         self._game_data = {
             'game_id': game_id,
             'date': date,
+            # SHA-256 of the source file, set when the game is parsed from a file
+            'file_hash': None,
             'teams': teams or [],
             'vybor': {},
             'chisla': {},
@@ -113,18 +141,28 @@ class BdGame:
         except Exception as e:
             raise XLSParseError(f"Error checking game consistency: {e}")
 
-    def parse_from_file(self, file_path):
+    def parse_from_file(self, file_path, file_hash=None):
         """
         Parse XLSM file and populate game data.
 
         Args:
             file_path (str): Path to the XLSM file to parse
+            file_hash (str, optional): SHA-256 of the file if already known, computed otherwise
 
         Returns:
             bool: True if parsing was successful, False otherwise
         """
         try:
-            all_sheets = pd.read_excel(file_path, sheet_name=None)
+            try:
+                # The workbook is opened once and every sheet is read with its own header row
+                with pd.ExcelFile(file_path, engine=EXCEL_ENGINE) as workbook:
+                    all_sheets = {
+                        sheet_name: workbook.parse(sheet_name, header=SHEET_HEADER_ROWS.get(sheet_name, 0))
+                        for sheet_name in REQUIRED_SHEETS
+                    }
+            except ValueError as e:
+                # Raised by pandas when one of the required sheets is missing
+                raise XLSParseError(f"Error reading sheets: {e}")
 
             # Check game consistency before parsing
             self._check_game_consistency(all_sheets)
@@ -135,6 +173,7 @@ class BdGame:
 
             # Set the parsed data
             self._game_data['date'] = game_date
+            self._game_data['file_hash'] = file_hash or file_sha256(file_path)
             self._game_data['teams'] = teams
 
             # Initialize structure for teams
@@ -186,150 +225,125 @@ class BdGame:
         except Exception as e:
             raise XLSParseError(f"Error parsing teams: {e}")
 
+    def _team_rows(self, table, sheet_name, team_column=0):
+        """
+        Index a sheet table by its team column.
+
+        Args:
+            table (pd.DataFrame): Sheet table
+            sheet_name (str): Sheet name used in error messages
+            team_column (int): Position of the column with team names
+
+        Returns:
+            pd.DataFrame: Rows of the parsed teams, indexed by team name
+
+        Raises:
+            XLSParseError: If any of the teams is not found in the table
+        """
+        rows = table.set_index(table.columns[team_column])
+        # Only the first row of a team is used, as with a column scan
+        rows = rows[~rows.index.duplicated(keep='first')]
+        # Each team is returned once, so the result has a unique index
+        teams = pd.Index(self._game_data['teams']).unique()
+        # Report all missing teams at once with a single hash-based set operation
+        missing = teams.difference(rows.index, sort=False)
+        if len(missing) == 1:
+            raise XLSParseError(f"Team '{missing[0]}' not found in '{sheet_name}'")
+        if len(missing) > 1:
+            missing_list = ', '.join(f"'{team}'" for team in missing)
+            raise XLSParseError(f"Teams {missing_list} not found in '{sheet_name}'")
+        return rows.loc[teams]
+
+    def _check_sums(self, values, parts, sheet_name):
+        """
+        Check that the "Сумма" column equals the sum of the task columns for all teams.
+
+        Args:
+            values (pd.DataFrame): Numeric team rows indexed by team name
+            parts (list): Task columns that make up the sum
+            sheet_name (str): Sheet name used in error messages
+
+        Raises:
+            XLSParseError: Listing all teams with a sum mismatch
+        """
+        mismatch = values['Сумма'] != values[parts].sum(axis=1)
+        bad_teams = values.index[mismatch]
+        if len(bad_teams) == 1:
+            raise XLSParseError(f"Sum mismatch for team '{bad_teams[0]}' in '{sheet_name}'")
+        if len(bad_teams) > 1:
+            bad_list = ', '.join(f"'{team}'" for team in bad_teams)
+            raise XLSParseError(f"Sum mismatch for teams {bad_list} in '{sheet_name}'")
+
     def _parse_vybor(self, all_sheets):
         """Parse vybor data from the XLSM sheets."""
         try:
-            # Get the list of teams
-            teams = list(self._game_data['vybor'].keys())
-            # Get the "Общая таблица" sheet
-            general_table = all_sheets['Общая таблица']
+            # Get the "Общая таблица" sheet indexed by team
+            general_rows = self._team_rows(all_sheets['Общая таблица'], 'Общая таблица')
 
-            # Iterate over each team
-            for team in teams:
-                # Find the row index of the team in the first column
-                team_rows = general_table[general_table.iloc[:, 0] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Общая таблица'")
-                row_index = team_rows.index[0]
-                # Get the points from the column named "I"
-                points = np.nan_to_num(general_table.loc[row_index, 'I'])
-                # Add the team and points to the dictionary
-                self._game_data['vybor'][team] = points
+            # Add the points from the column named "I" for all teams to the dictionary
+            self._game_data['vybor'].update(general_rows['I'].astype(float).fillna(0).to_dict())
         except Exception as e:
             raise XLSParseError(f"Error parsing vybor: {e}")
 
     def _parse_chisla(self, all_sheets):
         """Parse chisla data from the XLSM sheets."""
         try:
-            # Get the list of teams
-            teams = list(self._game_data['chisla'].keys())
             # Get the "Числа" sheet
             chisla_table = all_sheets['Числа']
-            chisla_table.columns = chisla_table.iloc[0]
-            chisla_table = chisla_table[1:].reset_index(drop=True)
-
-            # Iterate over each team
-            for team in teams:
-                # Find the row index of the team in the first column
-                team_rows = chisla_table[chisla_table.iloc[:, 0] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Числа'")
-                row_index = team_rows.index[0]
-                # Get the values from the specified columns
-                i_value = np.nan_to_num(chisla_table.loc[row_index, 'I'])
-                ii_value = np.nan_to_num(chisla_table.loc[row_index, 'II'])
-                iii_value = np.nan_to_num(chisla_table.loc[row_index, 'III'])
-                iv_value = np.nan_to_num(chisla_table.loc[row_index, 'IV'])
-                v_value = np.nan_to_num(chisla_table.loc[row_index, 'V'])
-                sum_value = np.nan_to_num(chisla_table.loc[row_index, 'Сумма'])
-                # Check if the sum of I-V equals the value in "Сумма"
-                if sum_value != i_value + ii_value + iii_value + iv_value + v_value:
-                    raise XLSParseError(f"Sum mismatch for team '{team}' in 'Числа'")
-                # Store the team data in the dictionary
-                self._game_data['chisla'][team]['I'] = i_value
-                self._game_data['chisla'][team]['II'] = ii_value
-                self._game_data['chisla'][team]['III'] = iii_value
-                self._game_data['chisla'][team]['IV'] = iv_value
-                self._game_data['chisla'][team]['V'] = v_value
-                self._game_data['chisla'][team]['Сумма'] = sum_value
+            chisla_rows = self._team_rows(chisla_table, 'Числа')
+
+            # Check that the sum of I-V equals the value in "Сумма" for all teams at once
+            values = chisla_rows[['I', 'II', 'III', 'IV', 'V', 'Сумма']].astype(float).fillna(0)
+            self._check_sums(values, ['I', 'II', 'III', 'IV', 'V'], 'Числа')
+
+            # Store the team data in the dictionary
+            for team, team_values in values.to_dict(orient='index').items():
+                self._game_data['chisla'][team].update(team_values)
         except Exception as e:
             raise XLSParseError(f"Error parsing chisla: {e}")
 
     def _parse_pref(self, all_sheets):
         """Parse pref data from the XLSM sheets."""
         try:
-            # Get the "Преферанс" sheet
-            pref_table = all_sheets['Преферанс']
-            # Get the list of teams
-            teams = list(self._game_data['pref'].keys())
-
-            # Iterate over each team
-            for team in teams:
-                # Find the row index of the team in the first column
-                team_rows = pref_table[pref_table.iloc[:, 0] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Преферанс'")
-                row_index = team_rows.index[0]
-
-                # Store the team data in the dictionary directly
-                self._game_data['pref'][team]['I'] = np.nan_to_num(pref_table.loc[row_index, 'I'])
-                self._game_data['pref'][team]['II'] = np.nan_to_num(pref_table.loc[row_index, 'II'])
-                self._game_data['pref'][team]['III'] = np.nan_to_num(pref_table.loc[row_index, 'III'])
-                self._game_data['pref'][team]['IV'] = np.nan_to_num(pref_table.loc[row_index, 'IV'])
-                self._game_data['pref'][team]['V'] = np.nan_to_num(pref_table.loc[row_index, 'V'])
-                self._game_data['pref'][team]['VI'] = np.nan_to_num(pref_table.loc[row_index, 'VI'])
-                self._game_data['pref'][team]['VII'] = np.nan_to_num(pref_table.loc[row_index, 'VII'])
-                self._game_data['pref'][team]['Points'] = np.nan_to_num(pref_table.loc[row_index, 'Points'])
-                self._game_data['pref'][team]['Penalty'] = np.nan_to_num(pref_table.loc[row_index, 'Penalty'])
-                self._game_data['pref'][team]['Bonus'] = np.nan_to_num(pref_table.loc[row_index, 'Bonus'])
-                self._game_data['pref'][team]['Сумма'] = np.nan_to_num(pref_table.loc[row_index, 'Sum'])
+            # Get the "Преферанс" sheet indexed by team
+            pref_table = self._team_rows(all_sheets['Преферанс'], 'Преферанс')
+            columns = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'Points', 'Penalty', 'Bonus', 'Sum']
+
+            # Convert all team rows to dictionaries in one pass
+            pref_values = pref_table[columns].rename(columns={'Sum': 'Сумма'})
+            pref_values = pref_values.astype(float).fillna(0).to_dict(orient='index')
+
+            # Store the team data in the dictionary directly
+            for team, values in pref_values.items():
+                self._game_data['pref'][team].update(values)
         except Exception as e:
             raise XLSParseError(f"Error parsing pref: {e}")
 
     def _parse_pairs(self, all_sheets):
         """Parse pairs data from the XLSM sheets."""
         try:
-            # Get the list of teams
-            teams = list(self._game_data['pairs'].keys())
-            # Get the "Общая таблица" sheet
-            general_table = all_sheets['Общая таблица']
+            # Get the "Общая таблица" sheet indexed by team
+            general_rows = self._team_rows(all_sheets['Общая таблица'], 'Общая таблица')
 
-            # Iterate over each team
-            for team in teams:
-                # Find the row index of the team in the first column
-                team_rows = general_table[general_table.iloc[:, 0] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Общая таблица'")
-                row_index = team_rows.index[0]
-                # Get the points from the column named "IV"
-                points = np.nan_to_num(general_table.loc[row_index, 'IV'])
-                # Add the team and points to the dictionary
-                self._game_data['pairs'][team] = points
+            # Add the points from the column named "IV" for all teams to the dictionary
+            self._game_data['pairs'].update(general_rows['IV'].astype(float).fillna(0).to_dict())
         except Exception as e:
             raise XLSParseError(f"Error parsing pairs: {e}")
 
     def _parse_razobl(self, all_sheets):
         """Parse razobl data from the XLSM sheets."""
         try:
-            # Get the list of teams
-            teams = list(self._game_data['razobl'].keys())
             # Get the "Разоблачение" sheet
             razobl_table = all_sheets['Разоблачение']
-            razobl_table.columns = razobl_table.iloc[0]
-            razobl_table = razobl_table[1:].reset_index(drop=True)
-
-            # Iterate over each team
-            for team in teams:
-                # Find the row index of the team in the first column
-                team_rows = razobl_table[razobl_table.iloc[:, 0] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Разоблачение'")
-                row_index = team_rows.index[0]
-                # Get the values from the specified columns
-                i_value = np.nan_to_num(razobl_table.loc[row_index, 'I'])
-                ii_value = np.nan_to_num(razobl_table.loc[row_index, 'II'])
-                iii_value = np.nan_to_num(razobl_table.loc[row_index, 'III'])
-                iv_value = np.nan_to_num(razobl_table.loc[row_index, 'IV'])
-                sum_value = np.nan_to_num(razobl_table.loc[row_index, 'Сумма'])
-                # Check if the sum of I-IV equals the value in "Сумма"
-                if sum_value != i_value + ii_value + iii_value + iv_value:
-                    raise XLSParseError(f"Sum mismatch for team '{team}' in 'Разоблачение'")
-                # Store the team data in the dictionary
-                self._game_data['razobl'][team]['I'] = i_value
-                self._game_data['razobl'][team]['II'] = ii_value
-                self._game_data['razobl'][team]['III'] = iii_value
-                self._game_data['razobl'][team]['IV'] = iv_value
-                self._game_data['razobl'][team]['Сумма'] = sum_value
+            razobl_rows = self._team_rows(razobl_table, 'Разоблачение')
+
+            # Check that the sum of I-IV equals the value in "Сумма" for all teams at once
+            values = razobl_rows[['I', 'II', 'III', 'IV', 'Сумма']].astype(float).fillna(0)
+            self._check_sums(values, ['I', 'II', 'III', 'IV'], 'Разоблачение')
+
+            # Store the team data in the dictionary
+            for team, team_values in values.to_dict(orient='index').items():
+                self._game_data['razobl'][team].update(team_values)
         except Exception as e:
             raise XLSParseError(f"Error parsing razobl: {e}")
 
@@ -339,90 +353,55 @@ class BdGame:
         try:
             auction_data = self._game_data['auction']
 
-            # Initialize total points based on game data
-            total_points = {}
-            for team in auction_data.keys():
-                total_points[team] = (
-                    self._game_data['vybor'][team] +
-                    self._game_data['chisla'][team]['Сумма'] +
-                    self._game_data['pref'][team]['Сумма'] +
-                    self._game_data['pairs'][team] +
-                    self._game_data['razobl'][team]['Сумма']
-                )
-
             # Define the columns to process
             columns = ['I', 'II', 'III', 'IV']
+            teams = list(auction_data)
 
-            # Define rate distribution based on rate_params
+            # Initialize total points based on game data
+            total_points = pd.Series([
+                self._game_data['vybor'][team] +
+                self._game_data['chisla'][team]['Сумма'] +
+                self._game_data['pref'][team]['Сумма'] +
+                self._game_data['pairs'][team] +
+                self._game_data['razobl'][team]['Сумма']
+                for team in teams
+            ], index=teams, dtype=float)
+
+            # Define rate distribution based on rate_params, teams beyond it get rate 1.0
             rate_distribution = [2.5] * rate_params['dvaipo_quan'] + [2.0] * rate_params['dva_quan'] + \
                                 [1.5] * rate_params['jedanipo_quan']
+            position_rates = np.ones(max(len(teams), len(rate_distribution)))
+            position_rates[:len(rate_distribution)] = rate_distribution
+            position_rates = position_rates[:len(teams)]
+
+            # Valid base points (points divided by rate)
+            valid_values = set(range(0, 1600, 100))
 
             # Iterate over each column
             for col in columns:
-                # Extract bids and corresponding team names with total points
-                teams_data = [(team, auction_data[team][col]['bid'], total_points[team])
-                              for team in auction_data]
+                # Task dictionaries of all teams for this column, in the order of teams
+                cells = [auction_data[team][col] for team in teams]
+                bids = np.array([cell['bid'] for cell in cells], dtype=float)
+                task_points = np.array([cell['points'] for cell in cells], dtype=float)
+                points_before = total_points.to_numpy()
 
                 # Sort by bid (ascending - more negative = higher bid), then by total_points (ascending)
                 # Lower bid value (more negative) = better position, same bid -> lower points = better position
-                teams_data.sort(key=lambda x: (x[1], x[2]))
-
-
-                # Track groups of teams with identical bid and total_points
-                conflict_groups = []
-                position = 0
-
-                while position < len(teams_data):
-                    current_bid = teams_data[position][1]
-                    current_points = teams_data[position][2]
-
-                    # Find all teams with the same bid and total_points
-                    group = []
-                    while (position < len(teams_data) and
-                           teams_data[position][1] == current_bid and
-                           teams_data[position][2] == current_points):
-                        group.append(teams_data[position][0])
-                        position += 1
-
-                    conflict_groups.append(group)
-
-                # Assign rates to each group
-                rate_position = 0
-                has_conflicts = False
-
-                for group in conflict_groups:
-                    group_size = len(group)
-
-                    if group_size > 1 and rate_position < len(rate_distribution):
-                        # Conflict: multiple teams with same bid and points
-                        has_conflicts = True
-
-                        # Calculate average rate for this group
-                        rates_sum = 0.0
-                        rates_count = 0
-
-                        for i in range(group_size):
-                            if rate_position + i < len(rate_distribution):
-                                rates_sum += rate_distribution[rate_position + i]
-                            else:
-                                rates_sum += 1.0
-                            rates_count += 1
-
-                        avg_rate = rates_sum / rates_count
-
-                        # Assign the average rate to all teams in the group
-                        for team in group:
-                            auction_data[team][col]['rate'] = avg_rate
-
-                    else:
-                        # No conflict: assign rates individually
-                        for team in group:
-                            if rate_position < len(rate_distribution):
-                                auction_data[team][col]['rate'] = rate_distribution[rate_position]
-                            else:
-                                auction_data[team][col]['rate'] = 1.0
-
-                    rate_position += group_size
+                order = np.lexsort((points_before, bids))
+                sorted_bids = bids[order]
+                sorted_points = points_before[order]
+
+                # Group teams with identical bid and total_points, a new group starts where a key changes
+                new_group = np.ones(len(teams), dtype=bool)
+                new_group[1:] = (sorted_bids[1:] != sorted_bids[:-1]) | (sorted_points[1:] != sorted_points[:-1])
+                group_ids = np.cumsum(new_group) - 1
+                group_sizes = np.bincount(group_ids)
+                has_conflicts = bool((group_sizes > 1).any())
+
+                # Teams in a conflict group share the average rate of the positions they occupy
+                group_rates = np.bincount(group_ids, weights=position_rates) / group_sizes
+                for team_index, group_id in zip(order, group_ids):
+                    cells[team_index]['rate'] = float(group_rates[group_id])
 
                 # DEBUG: Print detailed information if conflicts were detected
                 # if has_conflicts:
@@ -432,13 +411,12 @@ class BdGame:
                 #     print(f"{'№':<4} {'Команда':<40} {'Ставка':<12} {'Баллы до':<12} {'Коэфф.':<10} {'Конфликт':<10}")
                 #     print("-" * 120)
                 #
-                #     for idx, (team, bid, points) in enumerate(teams_data, 1):
+                #     for idx, (team_index, group_id) in enumerate(zip(order, group_ids), 1):
+                #         team = teams[team_index]
+                #         bid = bids[team_index]
+                #         points = points_before[team_index]
                 #         # Check if this team is in a conflict group
-                #         is_conflict = False
-                #         for group in conflict_groups:
-                #             if len(group) > 1 and team in group:
-                #                 is_conflict = True
-                #                 break
+                #         is_conflict = group_sizes[group_id] > 1
                 #
                 #         conflict_mark = "  ***" if is_conflict else ""
                 #         rate = auction_data[team][col]['rate']
@@ -457,14 +435,12 @@ class BdGame:
                 #     print("=" * 120 + "\n")
 
                 # Update total_points for the next column
-                for team in auction_data:
-                    total_points[team] += auction_data[team][col]['bid'] + auction_data[team][col]['points']
+                total_points = total_points + bids + task_points
 
                 # Validate that points divided by rate are in the valid range
-                valid_values = set(range(0, 1600, 100))
-                for team in auction_data:
-                    points = auction_data[team][col]['points']
-                    rate = auction_data[team][col]['rate']
+                for team, cell in zip(teams, cells):
+                    points = cell['points']
+                    rate = cell['rate']
 
                     base_points = points / rate
                     # Use proper rounding that works for both positive and negative numbers
@@ -485,42 +461,28 @@ class BdGame:
     def _parse_auction(self, all_sheets):
         """Parse auction data from the XLSM sheets."""
         try:
-            # Get the list of teams
-            teams = list(self._game_data['auction'].keys())
             # Get the "Аукцион" sheet
             auction_table = all_sheets['Аукцион']
-            # Get the "Общая таблица" sheet
-            general_table = all_sheets['Общая таблица']
-
-            # Iterate over each team
-            for team in teams:
-                # Find the row index of the team in the first column
-                team_rows = auction_table[auction_table.iloc[:, 0] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Аукцион'")
-                row_index = team_rows.index[0]
-
-                # Collect values from columns I-IV and the columns following each of them
-                i_value = np.nan_to_num(auction_table.loc[row_index, 'I'])
-                i_points = np.nan_to_num(auction_table.loc[row_index, auction_table.columns[auction_table.columns.get_loc('I') + 1]])
-                ii_value = np.nan_to_num(auction_table.loc[row_index, 'II'])
-                ii_points = np.nan_to_num(auction_table.loc[row_index, auction_table.columns[auction_table.columns.get_loc('II') + 1]])
-                iii_value = np.nan_to_num(auction_table.loc[row_index, 'III'])
-                iii_points = np.nan_to_num(auction_table.loc[row_index, auction_table.columns[auction_table.columns.get_loc('III') + 1]])
-                iv_value = np.nan_to_num(auction_table.loc[row_index, 'IV'])
-                iv_points = np.nan_to_num(auction_table.loc[row_index, auction_table.columns[auction_table.columns.get_loc('IV') + 1]])
-                sum_value = np.nan_to_num(auction_table.loc[row_index, 'Сумма баллов в конкурсе'])
-
-                # Store the team data in the dictionary
-                self._game_data['auction'][team]['I']['bid'] = i_value
-                self._game_data['auction'][team]['I']['points'] = i_points
-                self._game_data['auction'][team]['II']['bid'] = ii_value
-                self._game_data['auction'][team]['II']['points'] = ii_points
-                self._game_data['auction'][team]['III']['bid'] = iii_value
-                self._game_data['auction'][team]['III']['points'] = iii_points
-                self._game_data['auction'][team]['IV']['bid'] = iv_value
-                self._game_data['auction'][team]['IV']['points'] = iv_points
-                self._game_data['auction'][team]['Сумма'] = sum_value
+            auction_rows = self._team_rows(auction_table, 'Аукцион')
+            # Get the "Общая таблица" sheet indexed by team
+            general_rows = self._team_rows(all_sheets['Общая таблица'], 'Аукцион')
+
+            # Points of each task are stored in the column following its bid column
+            tasks = ['I', 'II', 'III', 'IV']
+            columns = auction_table.columns
+            points_columns = {task: columns[columns.get_loc(task) + 1] for task in tasks}
+
+            # Convert all team rows to dictionaries in one pass
+            sum_column = 'Сумма баллов в конкурсе'
+            values = auction_rows[tasks + list(points_columns.values()) + [sum_column]]
+            values = values.astype(float).fillna(0).to_dict(orient='index')
+
+            # Store bids and points of tasks I-IV in the dictionary
+            for team, row in values.items():
+                for task in tasks:
+                    self._game_data['auction'][team][task]['bid'] = row[task]
+                    self._game_data['auction'][team][task]['points'] = row[points_columns[task]]
+                self._game_data['auction'][team]['Сумма'] = row[sum_column]
 
             # Retrieve rate parameters from the specified cells
             total_rates_quan = auction_table.loc[31, 'Unnamed: 2']
@@ -548,54 +510,31 @@ class BdGame:
             total_points = self._restore_auction_rates(rate_params)
 
             # Validate that total_points matches the values in the "Всего баллов" column
-            for team in teams:
-                team_rows = general_table[general_table.iloc[:, 0] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Аукцион'")
-                row_index = team_rows.index[0]
-                expected_total_points = (
-                    np.nan_to_num(general_table.loc[row_index, 'I']) +
-                    np.nan_to_num(general_table.loc[row_index, 'II']) +
-                    np.nan_to_num(general_table.loc[row_index, 'III']) +
-                    np.nan_to_num(general_table.loc[row_index, 'IV']) +
-                    np.nan_to_num(general_table.loc[row_index, 'V']) +
-                    np.nan_to_num(general_table.loc[row_index, 'VI'])
-                )
-                # Allow difference of exactly 5 or exact match. +5 or -5 points are possible due to 1,25 and 2,25 rates
-                # with game rounding specifics.
-                diff = abs(total_points[team] - expected_total_points)
-                if diff != 0 and diff != 5:
-                    raise XLSParseError(f"Total points mismatch for team '{team}': {total_points[team]} != {expected_total_points} (difference: {diff})")
+            expected_total_points = general_rows[['I', 'II', 'III', 'IV', 'V', 'VI']].astype(float).fillna(0).sum(axis=1)
+            # Allow difference of exactly 5 or exact match. +5 or -5 points are possible due to 1,25 and 2,25 rates
+            # with game rounding specifics.
+            diff = (total_points - expected_total_points).abs()
+            mismatch = (diff != 0) & (diff != 5)
+            if mismatch.any():
+                team = mismatch.idxmax()
+                raise XLSParseError(f"Total points mismatch for team '{team}': {total_points[team]} != "
+                                    f"{expected_total_points[team]} (difference: {diff[team]})")
         except Exception as e:
             raise XLSParseError(f"Error parsing auction: {e}")
 
     def _parse_mot(self, all_sheets):
         """Parse mot data from the XLSM sheets."""
         try:
-            # Get the "Момент истины" sheet
-            mot_table = all_sheets['Момент истины']
-            # Get the list of teams
-            teams = list(self._game_data['mot'].keys())
-
-            # Iterate over each team
-            for team in teams:
-                # Find the row index of the team in the first column
-                team_rows = mot_table[mot_table.iloc[:, 1] == team]
-                if team_rows.empty:
-                    raise XLSParseError(f"Team '{team}' not found in 'Момент истины'")
-                row_index = team_rows.index[0]
-
-                # Extract values from the specified columns
-                i_value = np.nan_to_num(mot_table.loc[row_index, 'I'])
-                ii_value = np.nan_to_num(mot_table.loc[row_index, 'II'])
-                iii_value = np.nan_to_num(mot_table.loc[row_index, 'III'])
-                sum_value = i_value + ii_value + iii_value
-
-                # Store the team data in the dictionary with calculated sum
-                self._game_data['mot'][team]['I'] = i_value
-                self._game_data['mot'][team]['II'] = ii_value
-                self._game_data['mot'][team]['III'] = iii_value
-                self._game_data['mot'][team]['Сумма'] = sum_value
+            # Get the "Момент истины" sheet indexed by team (team names are in the second column)
+            mot_table = self._team_rows(all_sheets['Момент истины'], 'Момент истины', team_column=1)
+
+            # Extract values from the specified columns and calculate the sum
+            values = mot_table[['I', 'II', 'III']].astype(float).fillna(0)
+            values['Сумма'] = values['I'] + values['II'] + values['III']
+
+            # Store the team data in the dictionary with calculated sum
+            for team, team_values in values.to_dict(orient='index').items():
+                self._game_data['mot'][team].update(team_values)
         except Exception as e:
             raise XLSParseError(f"Error parsing mot: {e}")
 
@@ -1,9 +1,16 @@
 import os
 import unicodedata
-from sqlalchemy import create_engine, Column, Integer, String, Numeric, Date, ForeignKey, DateTime, func
+from sqlalchemy import create_engine, event, Column, Integer, String, Numeric, Date, ForeignKey, DateTime, Index, func
+from sqlalchemy import select, insert, delete, and_, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship, selectinload
+from sqlalchemy.orm import sessionmaker, relationship, raiseload
 import datetime
+import hashlib
+import json
+from contextlib import contextmanager
+from decimal import Decimal, ROUND_HALF_UP
 import logging
 from config import LOG_LEVEL, SQLALCHEMY_LOGGING
 from config import DATABASE_URL
@@ -14,9 +21,18 @@ logging.basicConfig(level=getattr(logging, LOG_LEVEL.upper(), logging.INFO))
 if SQLALCHEMY_LOGGING:
     logging.getLogger("sqlalchemy.engine").setLevel(getattr(logging, LOG_LEVEL.upper(), logging.INFO))
 
+logger = logging.getLogger(__name__)
+
 # Base class for all models
 Base = declarative_base()
 
+# Precision of all Numeric(10, 2) result columns
+CENTS = Decimal('0.01')
+
+# Set SQL_STRICT_LOADS=1 to make lazy relationship loads in get_game_data raise
+# an error instead of silently issuing extra SELECTs (useful while developing)
+SQL_STRICT_LOADS = os.environ.get('SQL_STRICT_LOADS') == '1'
+
 
 def normalize_team_name(team_name):
     """
@@ -62,22 +78,98 @@ def normalize_team_name(team_name):
 
 
 # Define models corresponding to database tables
+def to_decimal(value):
+    """
+    Convert a parsed numeric value to Decimal with the 2 decimal places used in DB.
+
+    Args:
+        value: Number from parsed game data (int, float, numpy scalar or Decimal)
+
+    Returns:
+        Decimal: Value rounded to 0.01
+    """
+    # Going through str keeps the shortest float representation (0.1 -> '0.1')
+    return Decimal(str(value)).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def team_totals(game_data):
+    """
+    Calculate total points of every team in parsed game data.
+
+    Every component is rounded to the 2 decimal places stored in DB, so the
+    totals can be compared exactly with the Numeric(10, 2) sums from team_game_scores.
+
+    Args:
+        game_data (dict): Game data from BdGame.get_data()
+
+    Returns:
+        dict: Mapping of normalized team name to total points (Decimal)
+    """
+    totals = {}
+    for team_name in game_data['teams']:
+        totals[normalize_team_name(team_name)] = sum(
+            to_decimal(points) for points in (
+                game_data['vybor'][team_name],
+                game_data['chisla'][team_name]['Сумма'],
+                game_data['pref'][team_name]['Сумма'],
+                game_data['pairs'][team_name],
+                game_data['razobl'][team_name]['Сумма'],
+                game_data['auction'][team_name]['Сумма'],
+                game_data['mot'][team_name]['Сумма'],
+            )
+        )
+    return totals
+
+
+def game_signature(game_date, totals):
+    """
+    Build a signature identifying a game by its date, teams and their total points.
+
+    Identical games (same date, same set of teams with the same totals) get the same
+    signature regardless of the order of teams.
+
+    Args:
+        game_date (datetime.date): Date of the game
+        totals (dict): Mapping of normalized team name to total points
+
+    Returns:
+        str: Hex SHA-256 digest (64 characters)
+    """
+    payload = {
+        'date': game_date.isoformat(),
+        'teams': sorted([name, str(to_decimal(total))] for name, total in totals.items()),
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
 class Game(Base):
     __tablename__ = 'games'
+    __table_args__ = (
+        # Games are looked up by date when searching for duplicates
+        Index('ix_games_game_date', 'game_date'),
+        Index('ix_games_signature', 'signature'),
+        Index('ix_games_file_hash', 'file_hash'),
+    )
 
     game_id = Column(Integer, primary_key=True)
     game_date = Column(Date, nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # game_signature() of the game, used to find identical games with one indexed lookup
+    signature = Column(String(64))
+    # SHA-256 of the source XLSM file, used to skip already imported files before parsing
+    file_hash = Column(String(64))
 
     # Define relationships
-    teams = relationship("GameTeam", back_populates="game")
-    vybor_results = relationship("Vybor", back_populates="game")
-    chisla_results = relationship("Chisla", back_populates="game")
-    pref_results = relationship("Pref", back_populates="game")
-    pairs_results = relationship("Pairs", back_populates="game")
-    razobl_results = relationship("Razobl", back_populates="game")
-    auction_results = relationship("Auction", back_populates="game")
-    mot_results = relationship("Mot", back_populates="game")
+    # Child rows are removed by the database via ON DELETE CASCADE,
+    # so the ORM doesn't need to load them before deleting a game
+    teams = relationship("GameTeam", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
+    vybor_results = relationship("Vybor", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
+    chisla_results = relationship("Chisla", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
+    pref_results = relationship("Pref", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
+    pairs_results = relationship("Pairs", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
+    razobl_results = relationship("Razobl", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
+    auction_results = relationship("Auction", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
+    mot_results = relationship("Mot", back_populates="game", cascade="all, delete-orphan", passive_deletes=True)
 
 class Team(Base):
     __tablename__ = 'teams'
@@ -98,7 +190,7 @@ class Team(Base):
 class GameTeam(Base):
     __tablename__ = 'game_teams'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
 
     # Define relationships
@@ -108,7 +200,7 @@ class GameTeam(Base):
 class Vybor(Base):
     __tablename__ = 'vybor'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
     points = Column(Numeric(10, 2), nullable=False)
 
@@ -119,7 +211,7 @@ class Vybor(Base):
 class Chisla(Base):
     __tablename__ = 'chisla'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
     task_1 = Column(Numeric(10, 2), nullable=False)
     task_2 = Column(Numeric(10, 2), nullable=False)
@@ -135,7 +227,7 @@ class Chisla(Base):
 class Pref(Base):
     __tablename__ = 'pref'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
     task_1 = Column(Numeric(10, 2), nullable=False)
     task_2 = Column(Numeric(10, 2), nullable=False)
@@ -156,7 +248,7 @@ class Pref(Base):
 class Pairs(Base):
     __tablename__ = 'pairs'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
     points = Column(Numeric(10, 2), nullable=False)
 
@@ -167,7 +259,7 @@ class Pairs(Base):
 class Razobl(Base):
     __tablename__ = 'razobl'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
     task_1 = Column(Numeric(10, 2), nullable=False)
     task_2 = Column(Numeric(10, 2), nullable=False)
@@ -182,7 +274,7 @@ class Razobl(Base):
 class Auction(Base):
     __tablename__ = 'auction'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
     task_1_bid = Column(Numeric(10, 2), nullable=False)
     task_1_points = Column(Numeric(10, 2), nullable=False)
@@ -205,7 +297,7 @@ class Auction(Base):
 class Mot(Base):
     __tablename__ = 'mot'
 
-    game_id = Column(Integer, ForeignKey('games.game_id'), primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
     task_1 = Column(Numeric(10, 2), nullable=False)
     task_2 = Column(Numeric(10, 2), nullable=False)
@@ -218,11 +310,13 @@ class Mot(Base):
 
 class TeamGameScore(Base):
     """
-    ORM model for the SQL view team_game_scores.
+    ORM model for the table team_game_scores.
 
-    This view contains aggregated results of all teams for each game.
+    This table contains aggregated results of all teams for each game.
     It combines data from the tables games, teams and individual game categories (vybor, chisla,
     pref, pairs, razobl, auction, mot) to simplify analysis and comparison of results.
+    Rows are written by Database.add_game together with the game and removed with it
+    via ON DELETE CASCADE, so reads don't have to join all category tables.
 
     Main purposes:
     - Quick access to total points of teams for each category
@@ -231,27 +325,78 @@ class TeamGameScore(Base):
     """
 
     __tablename__ = 'team_game_scores'
+    __table_args__ = (
+        Index('ix_team_game_scores_game_date', 'game_date'),
+        Index('ix_team_game_scores_team_name', 'team_name'),
+    )
 
-    # Indicate that this is a view, not a regular table
-    __table_args__ = {'info': {'is_view': True}}
-
-    # Primary keys are required for ORM
-    game_id = Column(Integer, primary_key=True)
-    team_id = Column(Integer, primary_key=True)
-    game_date = Column(Date)
-    team_name = Column(String)
+    game_id = Column(Integer, ForeignKey('games.game_id', ondelete='CASCADE'), primary_key=True)
+    team_id = Column(Integer, ForeignKey('teams.team_id'), primary_key=True)
+    game_date = Column(Date, nullable=False)
+    team_name = Column(String(256), nullable=False)
 
     # Points by game categories
-    vybor_points = Column(Numeric)    # Points for "Choice"
-    chisla_points = Column(Numeric)   # Points for "Numbers"
-    pref_points = Column(Numeric)     # Points for "Preference"
-    pairs_points = Column(Numeric)    # Points for "Pairs"
-    razobl_points = Column(Numeric)   # Points for "Revelation" ("Razobl")
-    auction_points = Column(Numeric)  # Points for "Auction"
-    mot_points = Column(Numeric)      # Points for "Moment of Truth"
+    vybor_points = Column(Numeric(10, 2))    # Points for "Choice"
+    chisla_points = Column(Numeric(10, 2))   # Points for "Numbers"
+    pref_points = Column(Numeric(10, 2))     # Points for "Preference"
+    pairs_points = Column(Numeric(10, 2))    # Points for "Pairs"
+    razobl_points = Column(Numeric(10, 2))   # Points for "Revelation" ("Razobl")
+    auction_points = Column(Numeric(10, 2))  # Points for "Auction"
+    mot_points = Column(Numeric(10, 2))      # Points for "Moment of Truth"
 
     # Total points from all categories combined
-    total_points = Column(Numeric)    # Sum of all category points
+    total_points = Column(Numeric(10, 2), nullable=False)    # Sum of all category points
+
+
+def team_game_scores_select(game_id):
+    """
+    Build a SELECT computing team_game_scores rows of a game from the category tables.
+
+    Args:
+        game_id (int): Game ID
+
+    Returns:
+        Select: Statement with columns in the order of TeamGameScore table columns
+    """
+    def results_of(model):
+        return and_(model.game_id == GameTeam.game_id, model.team_id == GameTeam.team_id)
+
+    total_points = (
+        func.coalesce(Vybor.points, 0) +
+        func.coalesce(Chisla.total_sum, 0) +
+        func.coalesce(Pref.total_sum, 0) +
+        func.coalesce(Pairs.points, 0) +
+        func.coalesce(Razobl.total_sum, 0) +
+        func.coalesce(Auction.total_sum, 0) +
+        func.coalesce(Mot.total_sum, 0)
+    )
+
+    return (
+        select(
+            Game.game_id, Game.game_date, Team.team_id, Team.team_name,
+            Vybor.points, Chisla.total_sum, Pref.total_sum, Pairs.points,
+            Razobl.total_sum, Auction.total_sum, Mot.total_sum, total_points
+        )
+        .select_from(GameTeam)
+        .join(Game, Game.game_id == GameTeam.game_id)
+        .join(Team, Team.team_id == GameTeam.team_id)
+        .outerjoin(Vybor, results_of(Vybor))
+        .outerjoin(Chisla, results_of(Chisla))
+        .outerjoin(Pref, results_of(Pref))
+        .outerjoin(Pairs, results_of(Pairs))
+        .outerjoin(Razobl, results_of(Razobl))
+        .outerjoin(Auction, results_of(Auction))
+        .outerjoin(Mot, results_of(Mot))
+        .where(GameTeam.game_id == game_id)
+    )
+
+
+# Prebuilt statements for frequent lookups; their compiled SQL is reused from the engine cache
+GAME_IDS_BY_DATE = select(Game.game_id).where(Game.game_date == bindparam('game_date'))
+GAME_IDS_BY_DATE_RANGE = select(Game.game_id).where(
+    Game.game_date.between(bindparam('start_date'), bindparam('end_date'))
+)
+
 
 class Database:
     def __init__(self, db_url=None):
@@ -259,165 +404,373 @@ class Database:
         if db_url is None:
             db_url = DATABASE_URL
 
-        self.engine = create_engine(db_url)
-        self.Session = sessionmaker(bind=self.engine)
+        # Keep compiled statements cached across the repeated lookups done
+        # by find_identical_game/get_game_data and check pooled connections
+        # before use, since MySQL drops idle connections
+        engine_kwargs = {
+            'query_cache_size': 1200,
+            'pool_pre_ping': True,
+        }
+        is_sqlite = make_url(db_url).get_backend_name() == 'sqlite'
+        if is_sqlite:
+            engine_kwargs['connect_args'] = {'check_same_thread': False}
+        else:
+            engine_kwargs['pool_size'] = 10
+            engine_kwargs['max_overflow'] = 20
+
+        self.engine = create_engine(db_url, **engine_kwargs)
+
+        if is_sqlite:
+            @event.listens_for(self.engine, "connect")
+            def _set_sqlite_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                # Off by default in SQLite, without it ON DELETE CASCADE does nothing
+                cursor.execute("PRAGMA foreign_keys=ON")
+                # WAL + relaxed sync greatly reduce fsync cost of add_game commits
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.execute("PRAGMA cache_size=-64000")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.close()
+
+        # Don't expire loaded objects on commit to avoid reload SELECTs afterwards
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+        # Team name -> team_id map, loaded lazily on first use
+        self._team_cache = None
+        self._uncommitted_teams = []
+
+    @contextmanager
+    def session_scope(self):
+        """
+        Provide a transactional scope around a series of operations.
 
-    def get_or_create_team(self, session, team_name):
+        Commits on success and rolls back on any error, so several calls
+        (e.g. duplicate check and insert) share one connection and transaction.
+
+        Yields:
+            Session: SQLAlchemy session
+        """
+        self._uncommitted_teams = []
+        with self.Session() as session:
+            try:
+                yield session
+                session.commit()
+                self._uncommitted_teams = []
+            except Exception:
+                session.rollback()
+                # Teams created in the rolled back transaction don't exist anymore
+                for team_name in self._uncommitted_teams:
+                    self._team_cache.pop(team_name, None)
+                self._uncommitted_teams = []
+                raise
+
+    @contextmanager
+    def savepoint(self, session):
+        """
+        Provide a nested transaction (SAVEPOINT) inside session_scope().
+
+        An error rolls back only the work done inside the block, so the outer
+        transaction can go on with other games and commit them together.
+
+        Args:
+            session: SQLAlchemy session from session_scope()
+
+        Yields:
+            Session: The same session
+        """
+        created_before = len(self._uncommitted_teams)
+        try:
+            with session.begin_nested():
+                yield session
+        except Exception:
+            # Teams created inside the savepoint don't exist anymore
+            for team_name in self._uncommitted_teams[created_before:]:
+                self._team_cache.pop(team_name, None)
+            del self._uncommitted_teams[created_before:]
+            raise
+
+    @contextmanager
+    def _use_session(self, session=None):
+        """
+        Use the given session or open a new one for the duration of the block.
+
+        Args:
+            session: SQLAlchemy session from the caller, or None
+
+        Yields:
+            Session: SQLAlchemy session
+        """
+        if session is not None:
+            yield session
+        else:
+            with self.Session() as new_session:
+                yield new_session
+
+    def _load_team_cache(self, session):
+        """
+        Prime the team name -> team_id cache with all teams from the database.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self._team_cache = dict(session.query(Team.team_name, Team.team_id).all())
+
+    @staticmethod
+    def _insert_ignore(session, model):
+        """
+        Build an INSERT that skips rows conflicting with existing unique keys.
+
+        Args:
+            session: SQLAlchemy session
+            model: ORM model to insert into
+
+        Returns:
+            Insert: INSERT IGNORE on MySQL, INSERT ... ON CONFLICT DO NOTHING on SQLite,
+                plain INSERT on other databases
         """
-        Get a team by name or create it if it doesn't exist.
+        dialect = session.get_bind().dialect.name
+        if dialect == 'sqlite':
+            return sqlite_insert(model).on_conflict_do_nothing()
+        if dialect in ('mysql', 'mariadb'):
+            return insert(model).prefix_with('IGNORE')
+        return insert(model)
+
+    def get_or_create_teams(self, session, team_names):
+        """
+        Get team ids by names, creating all missing teams at once.
         Team names are stored in normalized form (lowercase, trimmed whitespace, and collapsed internal spaces).
 
+        Known team ids are kept in a per-instance cache, so repeated games
+        don't issue a SELECT per team. Names missing from the cache are looked
+        up with one SELECT, the remaining teams are inserted with one INSERT
+        and their ids are read back with one SELECT. The INSERT skips teams
+        created concurrently by another process instead of failing.
+
+        Args:
+            session: SQLAlchemy session
+            team_names (list): Original team names from parsed data
+
+        Returns:
+            dict: Mapping of original team name to team_id in database
+        """
+        if self._team_cache is None:
+            self._load_team_cache(session)
+
+        # Normalize team names for storage and lookup
+        normalized_names = {team_name: normalize_team_name(team_name) for team_name in team_names}
+
+        # Original names of teams not in the cache, keyed by normalized name
+        missing = {}
+        for team_name, normalized_name in normalized_names.items():
+            if normalized_name not in self._team_cache:
+                missing.setdefault(normalized_name, team_name)
+
+        if missing:
+            # Teams may have been created by another process or Database instance since the cache was loaded
+            existing = session.query(Team.team_name, Team.team_id).filter(Team.team_name.in_(list(missing))).all()
+            self._team_cache.update(existing)
+            for normalized_name, _ in existing:
+                missing.pop(normalized_name, None)
+
+        if missing:
+            session.execute(self._insert_ignore(session, Team), [{'team_name': name} for name in missing])
+            created = session.query(Team.team_name, Team.team_id).filter(Team.team_name.in_(list(missing))).all()
+            self._team_cache.update(created)
+            # Remember the teams until commit so that they can be forgotten on rollback
+            self._uncommitted_teams.extend(missing)
+            for normalized_name, team_name in missing.items():
+                logger.warning("Created new team in database: '%s' (original: '%s')", normalized_name, team_name)
+
+        return {team_name: self._team_cache[normalized_name] for team_name, normalized_name in normalized_names.items()}
+
+    def get_or_create_team(self, session, team_name):
+        """
+        Get a team id by name or create the team if it doesn't exist.
+
         Args:
             session: SQLAlchemy session
             team_name (str): Original team name from parsed data
 
         Returns:
-            Team: Team object from database
+            int: team_id of the team in database
         """
-        # Normalize team name for storage and lookup
-        normalized_name = normalize_team_name(team_name)
-        team = session.query(Team).filter_by(team_name=normalized_name).first()
-
-        if not team:
-            team = Team(team_name=normalized_name)
-            session.add(team)
-            session.flush()  # To get the team_id
-            logging.warning(f"Created new team in database: '{normalized_name}' (original: '{team_name}')")
-        return team
-
-    def add_game(self, bd_game):
+        return self.get_or_create_teams(session, [team_name])[team_name]
+
+    def add_game(self, bd_game, session=None):
         """
         Add game data from BdGame instance to the database.
 
         Args:
             bd_game (BdGame): The BdGame instance containing game data
+            session: Optional session from session_scope(); records are only flushed
+                into it and committing is left to the caller
 
         Returns:
             bool: True if data was added successfully, False otherwise
+
+        Raises:
+            Exception: errors are propagated when a session is passed in
         """
-        session = self.Session()
+        if session is not None:
+            self._add_game_records(session, bd_game)
+            return True
+
         try:
-            # Get data structure from the BdGame instance
-            game_data = bd_game.get_data()
-            # Create a new game entry
-            game_date = game_data['date'].date() if hasattr(game_data['date'], 'date') else game_data['date']
-            game = Game(game_date=game_date)
-            session.add(game)
-            session.flush()  # To get the game_id
-
-            # Process teams
-            for team_name in game_data['teams']:
-                team = self.get_or_create_team(session, team_name)
-
-                # Add game-team relationship
-                game_team = GameTeam(game_id=game.game_id, team_id=team.team_id)
-                session.add(game_team)
-
-                # Add Vybor data
-                vybor_points = game_data['vybor'][team_name]
-                vybor = Vybor(
-                    game_id=game.game_id,
-                    team_id=team.team_id,
-                    points=vybor_points
-                )
-                session.add(vybor)
-
-                # Add Chisla data
-                chisla_data = game_data['chisla'][team_name]
-                chisla = Chisla(
-                    game_id=game.game_id,
-                    team_id=team.team_id,
-                    task_1=chisla_data['I'],
-                    task_2=chisla_data['II'],
-                    task_3=chisla_data['III'],
-                    task_4=chisla_data['IV'],
-                    task_5=chisla_data['V'],
-                    total_sum=chisla_data['Сумма']
-                )
-                session.add(chisla)
-
-                # Add Pref data
-                pref_data = game_data['pref'][team_name]
-                pref = Pref(
-                    game_id=game.game_id,
-                    team_id=team.team_id,
-                    task_1=pref_data['I'],
-                    task_2=pref_data['II'],
-                    task_3=pref_data['III'],
-                    task_4=pref_data['IV'],
-                    task_5=pref_data['V'],
-                    task_6=pref_data['VI'],
-                    task_7=pref_data['VII'],
-                    points=pref_data['Points'],
-                    penalty=pref_data['Penalty'],
-                    bonus=pref_data['Bonus'],
-                    total_sum=pref_data['Сумма']
-                )
-                session.add(pref)
-
-                # Add Pairs data
-                pairs_points = game_data['pairs'][team_name]
-                pairs = Pairs(
-                    game_id=game.game_id,
-                    team_id=team.team_id,
-                    points=pairs_points
-                )
-                session.add(pairs)
-
-                # Add Razobl data
-                razobl_data = game_data['razobl'][team_name]
-                razobl = Razobl(
-                    game_id=game.game_id,
-                    team_id=team.team_id,
-                    task_1=razobl_data['I'],
-                    task_2=razobl_data['II'],
-                    task_3=razobl_data['III'],
-                    task_4=razobl_data['IV'],
-                    total_sum=razobl_data['Сумма']
-                )
-                session.add(razobl)
-
-                # Add Auction data
-                auction_data = game_data['auction'][team_name]
-                auction = Auction(
-                    game_id=game.game_id,
-                    team_id=team.team_id,
-                    task_1_bid=auction_data['I']['bid'],
-                    task_1_points=auction_data['I']['points'],
-                    task_1_rate=auction_data['I'].get('rate'),
-                    task_2_bid=auction_data['II']['bid'],
-                    task_2_points=auction_data['II']['points'],
-                    task_2_rate=auction_data['II'].get('rate'),
-                    task_3_bid=auction_data['III']['bid'],
-                    task_3_points=auction_data['III']['points'],
-                    task_3_rate=auction_data['III'].get('rate'),
-                    task_4_bid=auction_data['IV']['bid'],
-                    task_4_points=auction_data['IV']['points'],
-                    task_4_rate=auction_data['IV'].get('rate'),
-                    total_sum=auction_data['Сумма']
-                )
-                session.add(auction)
-
-                # Add Mot data
-                mot_data = game_data['mot'][team_name]
-                mot = Mot(
-                    game_id=game.game_id,
-                    team_id=team.team_id,
-                    task_1=mot_data['I'],
-                    task_2=mot_data['II'],
-                    task_3=mot_data['III'],
-                    total_sum=mot_data['Сумма']
-                )
-                session.add(mot)
-
-            session.commit()
+            with self.session_scope() as session:
+                self._add_game_records(session, bd_game)
             return True
         except Exception as e:
-            session.rollback()
-            print(f"Error adding game data: {e}")
+            logger.error("Error adding game data: %s", e, exc_info=True)
             return False
-        finally:
-            session.close()
+
+    def _add_game_records(self, session, bd_game):
+        """
+        Add game and all contest records to the session.
+
+        Args:
+            session: SQLAlchemy session
+            bd_game (BdGame): The BdGame instance containing game data
+        """
+        # Get data structure from the BdGame instance
+        game_data = bd_game.get_data()
+        # Create a new game entry
+        game_date = game_data['date'].date() if hasattr(game_data['date'], 'date') else game_data['date']
+        game = Game(game_date=game_date, signature=game_signature(game_date, team_totals(game_data)),
+                    file_hash=game_data.get('file_hash'))
+        session.add(game)
+        session.flush()  # To get the game_id
+
+        # Resolve ids of all teams at once
+        team_ids = self.get_or_create_teams(session, game_data['teams'])
+
+        # Collect rows of every table and insert each table with one executemany
+        game_team_rows = []
+        vybor_rows = []
+        chisla_rows = []
+        pref_rows = []
+        pairs_rows = []
+        razobl_rows = []
+        auction_rows = []
+        mot_rows = []
+
+        # Process teams
+        for team_name in game_data['teams']:
+            team_id = team_ids[team_name]
+
+            # Add game-team relationship
+            game_team_rows.append(dict(game_id=game.game_id, team_id=team_id))
+
+            # Add Vybor data
+            vybor_points = game_data['vybor'][team_name]
+            vybor_rows.append(dict(
+                game_id=game.game_id,
+                team_id=team_id,
+                points=vybor_points
+            ))
+
+            # Add Chisla data
+            chisla_data = game_data['chisla'][team_name]
+            chisla_rows.append(dict(
+                game_id=game.game_id,
+                team_id=team_id,
+                task_1=chisla_data['I'],
+                task_2=chisla_data['II'],
+                task_3=chisla_data['III'],
+                task_4=chisla_data['IV'],
+                task_5=chisla_data['V'],
+                total_sum=chisla_data['Сумма']
+            ))
+
+            # Add Pref data
+            pref_data = game_data['pref'][team_name]
+            pref_rows.append(dict(
+                game_id=game.game_id,
+                team_id=team_id,
+                task_1=pref_data['I'],
+                task_2=pref_data['II'],
+                task_3=pref_data['III'],
+                task_4=pref_data['IV'],
+                task_5=pref_data['V'],
+                task_6=pref_data['VI'],
+                task_7=pref_data['VII'],
+                points=pref_data['Points'],
+                penalty=pref_data['Penalty'],
+                bonus=pref_data['Bonus'],
+                total_sum=pref_data['Сумма']
+            ))
+
+            # Add Pairs data
+            pairs_points = game_data['pairs'][team_name]
+            pairs_rows.append(dict(
+                game_id=game.game_id,
+                team_id=team_id,
+                points=pairs_points
+            ))
+
+            # Add Razobl data
+            razobl_data = game_data['razobl'][team_name]
+            razobl_rows.append(dict(
+                game_id=game.game_id,
+                team_id=team_id,
+                task_1=razobl_data['I'],
+                task_2=razobl_data['II'],
+                task_3=razobl_data['III'],
+                task_4=razobl_data['IV'],
+                total_sum=razobl_data['Сумма']
+            ))
+
+            # Add Auction data
+            auction_data = game_data['auction'][team_name]
+            auction_rows.append(dict(
+                game_id=game.game_id,
+                team_id=team_id,
+                task_1_bid=auction_data['I']['bid'],
+                task_1_points=auction_data['I']['points'],
+                task_1_rate=auction_data['I'].get('rate'),
+                task_2_bid=auction_data['II']['bid'],
+                task_2_points=auction_data['II']['points'],
+                task_2_rate=auction_data['II'].get('rate'),
+                task_3_bid=auction_data['III']['bid'],
+                task_3_points=auction_data['III']['points'],
+                task_3_rate=auction_data['III'].get('rate'),
+                task_4_bid=auction_data['IV']['bid'],
+                task_4_points=auction_data['IV']['points'],
+                task_4_rate=auction_data['IV'].get('rate'),
+                total_sum=auction_data['Сумма']
+            ))
+
+            # Add Mot data
+            mot_data = game_data['mot'][team_name]
+            mot_rows.append(dict(
+                game_id=game.game_id,
+                team_id=team_id,
+                task_1=mot_data['I'],
+                task_2=mot_data['II'],
+                task_3=mot_data['III'],
+                total_sum=mot_data['Сумма']
+            ))
+
+        for model, rows in (
+            (GameTeam, game_team_rows),
+            (Vybor, vybor_rows),
+            (Chisla, chisla_rows),
+            (Pref, pref_rows),
+            (Pairs, pairs_rows),
+            (Razobl, razobl_rows),
+            (Auction, auction_rows),
+            (Mot, mot_rows),
+        ):
+            if rows:
+                session.execute(insert(model), rows)
+
+        # Fill the scores table from the rows just written
+        score_columns = [
+            'game_id', 'game_date', 'team_id', 'team_name',
+            'vybor_points', 'chisla_points', 'pref_points', 'pairs_points',
+            'razobl_points', 'auction_points', 'mot_points', 'total_points',
+        ]
+        session.execute(insert(TeamGameScore).from_select(score_columns, team_game_scores_select(game.game_id)))
 
     def remove_game(self, game_id):
         """
@@ -430,159 +783,161 @@ class Database:
             ValueError: if the game is not found
             Exception: for other errors
         """
-        with self.Session() as session:
-            try:
-                game = session.query(Game).filter_by(game_id=game_id).first()
-                if not game:
-                    raise ValueError(f"Game with game_id={game_id} not found")
-
-                # Remove all related records in all contests
-                session.query(GameTeam).filter_by(game_id=game_id).delete()
-                session.query(Vybor).filter_by(game_id=game_id).delete()
-                session.query(Chisla).filter_by(game_id=game_id).delete()
-                session.query(Pref).filter_by(game_id=game_id).delete()
-                session.query(Pairs).filter_by(game_id=game_id).delete()
-                session.query(Razobl).filter_by(game_id=game_id).delete()
-                session.query(Auction).filter_by(game_id=game_id).delete()
-                session.query(Mot).filter_by(game_id=game_id).delete()
-
-                # Remove the game itself
-                session.delete(game)
-                session.commit()
-            except Exception:
-                session.rollback()
-                raise
+        # Commits on success, rolls back on any error
+        with self.Session.begin() as session:
+            # Single DELETE statement; related records in all contests
+            # are removed by ON DELETE CASCADE
+            result = session.execute(delete(Game).where(Game.game_id == game_id))
+            if result.rowcount == 0:
+                raise ValueError(f"Game with game_id={game_id} not found")
 
     def get_all_games(self):
         """Get all games from the database."""
-        session = self.Session()
-        try:
+        with self.Session() as session:
             return session.query(Game).all()
-        finally:
-            session.close()
 
-    def get_game_data(self, game_id):
+    def get_game_data(self, game_id, session=None):
         """
         Retrieve full game data from the database and return as BdGame.
 
         Args:
             game_id (int): Game ID
+            session: Optional session to reuse instead of opening a new one
 
         Returns:
-            BdGame: BdGame instance with all data
+            BdGame: BdGame instance with all data (points are Decimal values as stored in DB)
 
         Raises:
             ValueError: if game, teams, or team_id in results not found
             Exception: for other errors
         """
 
-        with self.Session() as session:
-            try:
-                game = session.query(Game).options(
-                    selectinload(Game.teams),
-                    selectinload(Game.vybor_results),
-                    selectinload(Game.chisla_results),
-                    selectinload(Game.pref_results),
-                    selectinload(Game.pairs_results),
-                    selectinload(Game.razobl_results),
-                    selectinload(Game.auction_results),
-                    selectinload(Game.mot_results)
-                ).filter_by(game_id=game_id).first()
+        with self._use_session(session) as session:
+            # One wide row per team with results of all contests
+            def results_of(model):
+                return and_(model.game_id == GameTeam.game_id, model.team_id == GameTeam.team_id)
+
+            query = (
+                session.query(Game.game_date, Team.team_name, Vybor, Chisla, Pref, Pairs, Razobl, Auction, Mot)
+                .select_from(GameTeam)
+                .join(Game, Game.game_id == GameTeam.game_id)
+                .join(Team, Team.team_id == GameTeam.team_id)
+                .outerjoin(Vybor, results_of(Vybor))
+                .outerjoin(Chisla, results_of(Chisla))
+                .outerjoin(Pref, results_of(Pref))
+                .outerjoin(Pairs, results_of(Pairs))
+                .outerjoin(Razobl, results_of(Razobl))
+                .outerjoin(Auction, results_of(Auction))
+                .outerjoin(Mot, results_of(Mot))
+                .filter(GameTeam.game_id == game_id)
+            )
+            if SQL_STRICT_LOADS:
+                # Fail loudly if anything below triggers a lazy load
+                query = query.options(raiseload('*'))
+            rows = query.all()
+
+            if rows:
+                game_date = rows[0].game_date
+            else:
+                # Game without teams or no game at all
+                game = session.get(Game, game_id)
                 if not game:
                     raise ValueError(f"Game with game_id={game_id} not found")
+                game_date = game.game_date
 
-                # Getting team names for BdGame initialization
-                teams = [gt.team.team_name for gt in game.teams]
+            # Getting team names for BdGame initialization
+            teams = [row.team_name for row in rows]
+
+            bd_game = BdGame(teams=teams, game_id=game_id, date=game_date)
+            game_data = bd_game.get_data()
 
-                bd_game = BdGame(teams=teams, game_id=game.game_id, date=game.game_date)
-                game_data = bd_game.get_data()
+            for row in rows:
+                team_name = row.team_name
 
                 # Vybor
-                for vybor in game.vybor_results:
-                    team_name = vybor.team.team_name
-                    game_data['vybor'][team_name] = float(vybor.points)
+                vybor = row.Vybor
+                if vybor is not None:
+                    game_data['vybor'][team_name] = vybor.points
 
                 # Chisla
-                for chisla in game.chisla_results:
-                    team_name = chisla.team.team_name
-                    game_data['chisla'][team_name]['I'] = float(chisla.task_1)
-                    game_data['chisla'][team_name]['II'] = float(chisla.task_2)
-                    game_data['chisla'][team_name]['III'] = float(chisla.task_3)
-                    game_data['chisla'][team_name]['IV'] = float(chisla.task_4)
-                    game_data['chisla'][team_name]['V'] = float(chisla.task_5)
-                    game_data['chisla'][team_name]['Сумма'] = float(chisla.total_sum)
+                chisla = row.Chisla
+                if chisla is not None:
+                    game_data['chisla'][team_name]['I'] = chisla.task_1
+                    game_data['chisla'][team_name]['II'] = chisla.task_2
+                    game_data['chisla'][team_name]['III'] = chisla.task_3
+                    game_data['chisla'][team_name]['IV'] = chisla.task_4
+                    game_data['chisla'][team_name]['V'] = chisla.task_5
+                    game_data['chisla'][team_name]['Сумма'] = chisla.total_sum
 
                 # Pref
-                for pref in game.pref_results:
-                    team_name = pref.team.team_name
-                    game_data['pref'][team_name]['I'] = float(pref.task_1)
-                    game_data['pref'][team_name]['II'] = float(pref.task_2)
-                    game_data['pref'][team_name]['III'] = float(pref.task_3)
-                    game_data['pref'][team_name]['IV'] = float(pref.task_4)
-                    game_data['pref'][team_name]['V'] = float(pref.task_5)
-                    game_data['pref'][team_name]['VI'] = float(pref.task_6)
-                    game_data['pref'][team_name]['VII'] = float(pref.task_7)
-                    game_data['pref'][team_name]['Points'] = float(pref.points)
-                    game_data['pref'][team_name]['Penalty'] = float(pref.penalty)
-                    game_data['pref'][team_name]['Bonus'] = float(pref.bonus)
-                    game_data['pref'][team_name]['Сумма'] = float(pref.total_sum)
+                pref = row.Pref
+                if pref is not None:
+                    game_data['pref'][team_name]['I'] = pref.task_1
+                    game_data['pref'][team_name]['II'] = pref.task_2
+                    game_data['pref'][team_name]['III'] = pref.task_3
+                    game_data['pref'][team_name]['IV'] = pref.task_4
+                    game_data['pref'][team_name]['V'] = pref.task_5
+                    game_data['pref'][team_name]['VI'] = pref.task_6
+                    game_data['pref'][team_name]['VII'] = pref.task_7
+                    game_data['pref'][team_name]['Points'] = pref.points
+                    game_data['pref'][team_name]['Penalty'] = pref.penalty
+                    game_data['pref'][team_name]['Bonus'] = pref.bonus
+                    game_data['pref'][team_name]['Сумма'] = pref.total_sum
 
                 # Pairs
-                for pairs in game.pairs_results:
-                    team_name = pairs.team.team_name
-                    game_data['pairs'][team_name] = float(pairs.points)
+                pairs = row.Pairs
+                if pairs is not None:
+                    game_data['pairs'][team_name] = pairs.points
 
                 # Razobl
-                for razobl in game.razobl_results:
-                    team_name = razobl.team.team_name
-                    game_data['razobl'][team_name]['I'] = float(razobl.task_1)
-                    game_data['razobl'][team_name]['II'] = float(razobl.task_2)
-                    game_data['razobl'][team_name]['III'] = float(razobl.task_3)
-                    game_data['razobl'][team_name]['IV'] = float(razobl.task_4)
-                    game_data['razobl'][team_name]['Сумма'] = float(razobl.total_sum)
+                razobl = row.Razobl
+                if razobl is not None:
+                    game_data['razobl'][team_name]['I'] = razobl.task_1
+                    game_data['razobl'][team_name]['II'] = razobl.task_2
+                    game_data['razobl'][team_name]['III'] = razobl.task_3
+                    game_data['razobl'][team_name]['IV'] = razobl.task_4
+                    game_data['razobl'][team_name]['Сумма'] = razobl.total_sum
 
                 # Auction
-                for auction in game.auction_results:
-                    team_name = auction.team.team_name
-                    game_data['auction'][team_name]['I']['bid'] = float(auction.task_1_bid)
-                    game_data['auction'][team_name]['I']['points'] = float(auction.task_1_points)
+                auction = row.Auction
+                if auction is not None:
+                    game_data['auction'][team_name]['I']['bid'] = auction.task_1_bid
+                    game_data['auction'][team_name]['I']['points'] = auction.task_1_points
                     game_data['auction'][team_name]['I']['rate'] = auction.task_1_rate
-                    game_data['auction'][team_name]['II']['bid'] = float(auction.task_2_bid)
-                    game_data['auction'][team_name]['II']['points'] = float(auction.task_2_points)
+                    game_data['auction'][team_name]['II']['bid'] = auction.task_2_bid
+                    game_data['auction'][team_name]['II']['points'] = auction.task_2_points
                     game_data['auction'][team_name]['II']['rate'] = auction.task_2_rate
-                    game_data['auction'][team_name]['III']['bid'] = float(auction.task_3_bid)
-                    game_data['auction'][team_name]['III']['points'] = float(auction.task_3_points)
+                    game_data['auction'][team_name]['III']['bid'] = auction.task_3_bid
+                    game_data['auction'][team_name]['III']['points'] = auction.task_3_points
                     game_data['auction'][team_name]['III']['rate'] = auction.task_3_rate
-                    game_data['auction'][team_name]['IV']['bid'] = float(auction.task_4_bid)
-                    game_data['auction'][team_name]['IV']['points'] = float(auction.task_4_points)
+                    game_data['auction'][team_name]['IV']['bid'] = auction.task_4_bid
+                    game_data['auction'][team_name]['IV']['points'] = auction.task_4_points
                     game_data['auction'][team_name]['IV']['rate'] = auction.task_4_rate
-                    game_data['auction'][team_name]['Сумма'] = float(auction.total_sum)
+                    game_data['auction'][team_name]['Сумма'] = auction.total_sum
 
                 # Mot
-                for mot in game.mot_results:
-                    team_name = mot.team.team_name
-                    game_data['mot'][team_name]['I'] = float(mot.task_1)
-                    game_data['mot'][team_name]['II'] = float(mot.task_2)
-                    game_data['mot'][team_name]['III'] = float(mot.task_3)
-                    game_data['mot'][team_name]['Сумма'] = float(mot.total_sum)
+                mot = row.Mot
+                if mot is not None:
+                    game_data['mot'][team_name]['I'] = mot.task_1
+                    game_data['mot'][team_name]['II'] = mot.task_2
+                    game_data['mot'][team_name]['III'] = mot.task_3
+                    game_data['mot'][team_name]['Сумма'] = mot.total_sum
 
-                return bd_game
+            return bd_game
 
-            except Exception:
-                raise
-
-    def get_game_ids_by_date(self, start_date, end_date=None):
+    def get_game_ids_by_date(self, start_date, end_date=None, session=None):
         """
         Get game IDs for games that occurred on a specific date or within a date range.
 
         Args:
             start_date (datetime.date or datetime.datetime): The specific date or start of the date range
             end_date (datetime.date or datetime.datetime, optional): The end of the date range
+            session: Optional session to reuse instead of opening a new one
 
         Returns:
             list: List of game IDs
         """
-        with self.Session() as session:
+        with self._use_session(session) as session:
             # Convert to date if datetime was provided
             if hasattr(start_date, 'date'):
                 start_date = start_date.date()
@@ -592,27 +947,40 @@ class Database:
                 if hasattr(end_date, 'date'):
                     end_date = end_date.date()
 
-                games = session.query(Game.game_id).filter(
-                    Game.game_date >= start_date,
-                    Game.game_date <= end_date
-                ).all()
+                result = session.execute(GAME_IDS_BY_DATE_RANGE, {'start_date': start_date, 'end_date': end_date})
             else:
                 # If only one date is provided, find games on that specific date
-                games = session.query(Game.game_id).filter(
-                    Game.game_date == start_date
-                ).all()
+                result = session.execute(GAME_IDS_BY_DATE, {'game_date': start_date})
 
-            # Extract game_ids from the result
-            game_ids = [game.game_id for game in games]
-            return game_ids
+            return result.scalars().all()
 
-    def find_identical_game(self, game_instance):
+    def get_imported_file_hashes(self, file_hashes, session=None):
         """
-        Checks for an identical game in the database using team_game_scores view.
-        Uses normalized team names for comparison.
+        Find which of the given source file hashes are already stored in the database.
+
+        Args:
+            file_hashes (iterable): SHA-256 hex digests of XLSM files
+            session: Optional session to reuse instead of opening a new one
+
+        Returns:
+            set: Hashes of files whose games are already in the database
+        """
+        file_hashes = list(set(file_hashes))
+        if not file_hashes:
+            return set()
+
+        with self._use_session(session) as session:
+            rows = session.query(Game.file_hash).filter(Game.file_hash.in_(file_hashes)).all()
+            return {row.file_hash for row in rows}
+
+    def find_identical_game(self, game_instance, session=None):
+        """
+        Checks for an identical game in the database by its signature
+        (date, normalized team names and total points of every team).
 
         Args:
             game_instance (BdGame): The parsed game data to check for duplicates
+            session: Optional session to reuse instead of opening a new one
 
         Returns:
             BdGame or None: Found identical game data or None if not found
@@ -622,67 +990,25 @@ class Database:
         # Convert to date object if datetime was provided
         game_date = game_data['date'].date() if hasattr(game_data['date'], 'date') else game_data['date']
 
-        # Get list of game IDs for the same date
-        game_ids = self.get_game_ids_by_date(game_date)
+        # DB already has normalized names, so we just need to normalize parsed team names
+        parsed_totals = team_totals(game_data)
 
-        if not game_ids:
+        # Several parsed teams collapsing into one normalized name can't match any stored game
+        if not parsed_totals or len(parsed_totals) != len(game_data['teams']):
             return None
 
-        with self.Session() as session:
-            for game_id in game_ids:
-                # Get records from team_game_scores view for this game
-                team_scores = session.query(TeamGameScore).filter_by(game_id=game_id).all()
-
-                # Compare team lists using normalized names
-                # DB already has normalized names, so we just need to normalize parsed team names
-                db_team_names = sorted([ts.team_name for ts in team_scores])
-                parsed_normalized_team_names = sorted([normalize_team_name(t) for t in game_data['teams']])
-
-                if parsed_normalized_team_names != db_team_names:
-                    continue
-
-                # Check if scores match for each team
-                scores_match = True
-
-                # Create a mapping from normalized team names to original names in game_data
-                normalized_to_original_map = {normalize_team_name(t): t for t in game_data['teams']}
-
-                for team_score in team_scores:
-                    # DB team name is already normalized
-                    db_team_name = team_score.team_name
-
-                    # Find corresponding team in parsed game data
-                    if db_team_name not in normalized_to_original_map:
-                        scores_match = False
-                        break
-
-                    original_team_name = normalized_to_original_map[db_team_name]
-
-                    # Calculate total points from parsed game data
-                    parsed_total = (
-                        float(game_data['vybor'][original_team_name]) +
-                        float(game_data['chisla'][original_team_name]['Сумма']) +
-                        float(game_data['pref'][original_team_name]['Сумма']) +
-                        float(game_data['pairs'][original_team_name]) +
-                        float(game_data['razobl'][original_team_name]['Сумма']) +
-                        float(game_data['auction'][original_team_name]['Сумма']) +
-                        float(game_data['mot'][original_team_name]['Сумма'])
-                    )
-
-                    # Get total points from database
-                    db_total = float(team_score.total_points)
-
-                    # Compare with small tolerance for floating point precision
-                    if abs(parsed_total - db_total) > 0.01:
-                        scores_match = False
-                        break
-
-                if scores_match:
-                    # Game is identical, return the result
-                    return self.get_game_data(game_id)
-
-            # No match found
-            return None
+        signature = game_signature(game_date, parsed_totals)
+
+        with self._use_session(session) as session:
+            # Identical games share the signature of date, teams and their totals
+            match = session.query(Game.game_id).filter(Game.signature == signature).first()
+
+            if match:
+                # Game is identical, return the result
+                return self.get_game_data(match.game_id, session=session)
+
+        # No match found
+        return None
 
 # Usage example
 if __name__ == "__main__":
@@ -1,10 +1,31 @@
 from config import DATABASE_URL, DEFAULT_GAME_DATE
 from db import Database, normalize_team_name
-import warnings
+import logging
+from functools import lru_cache
 
 
 # Re-export normalize_team_name for backwards compatibility
-__all__ = ['Database', 'normalize_team_name', 'initialize_database', 'save_game_to_database']
+__all__ = ['Database', 'normalize_team_name', 'get_database', 'initialize_database', 'save_game_to_database',
+           'save_games_to_database']
+
+logger = logging.getLogger(__name__)
+
+# Frame line around multi-line warnings
+SEPARATOR = '=' * 80
+
+
+@lru_cache(maxsize=1)
+def get_database():
+    """
+    Get the shared Database instance for DATABASE_URL.
+
+    The instance (and its connection pool) is created on first call and reused
+    afterwards, so repeated callers don't set up new connections.
+
+    Returns:
+        Database: Database instance
+    """
+    return Database(DATABASE_URL)
 
 
 def initialize_database():
@@ -15,7 +36,7 @@ def initialize_database():
         Database: Database instance if connection successful, None otherwise
     """
     try:
-        db = Database(DATABASE_URL)
+        db = get_database()
         print(f"Connected to database: {DATABASE_URL}")
         return db
     except Exception as e:
@@ -23,68 +44,123 @@ def initialize_database():
         return None
 
 
-def save_game_to_database(game_instance, db):
+def _game_date(game_instance):
+    """
+    Get the date of a parsed game as a date object.
+
+    Args:
+        game_instance (BdGame): BdGame instance containing parsed data
+
+    Returns:
+        datetime.date: Game date
+    """
+    game_date = game_instance.get_data()['date']
+    # Normalize game_date to a date object if it's a datetime
+    if hasattr(game_date, 'date'):
+        game_date = game_date.date()
+    return game_date
+
+
+def save_game_to_database(game_instance, db, session=None, log_success=True):
     """
     Saves game data to the database.
 
     Args:
         game_instance (BdGame): BdGame instance containing parsed data
         db: Database object for saving data
+        session: Optional session from db.session_scope(); the game is then saved
+            in a savepoint and committing is left to the caller
+        log_success (bool): Log a message when the game is saved; callers committing
+            the session themselves report success after the commit instead
 
     Returns:
         bool: True if data is successfully saved, False otherwise
     """
     try:
-        game_data = game_instance.get_data()
-
-        # Get game date
-        game_date = game_data['date']
-        # Normalize game_date to a date object if it's a datetime
-        if hasattr(game_date, 'date'):
-            game_date = game_date.date()
+        game_date = _game_date(game_instance)
+        # Formatted once for all messages below
+        date_str = game_date.strftime('%d.%m.%Y')
 
         # Check if game date matches the default date
         if game_date == DEFAULT_GAME_DATE:
-            warnings.warn(
-                f"\n{'='*80}\n"
-                f"WARNING: Game date matches the default date ({DEFAULT_GAME_DATE.strftime('%d.%m.%Y')})!\n"
-                f"The date was probably not set in the game file.\n"
-                f"Please correct the date in the source file and import the game again.\n"
-                f"The game may still be saved to the database with the specified date, unless it is detected as a duplicate.\n"
-                f"{'='*80}",
-                UserWarning
+            logger.warning(
+                "\n%s\n"
+                "WARNING: Game date matches the default date (%s)!\n"
+                "The date was probably not set in the game file.\n"
+                "Please correct the date in the source file and import the game again.\n"
+                "The game may still be saved to the database with the specified date, unless it is detected as a duplicate.\n"
+                "%s",
+                SEPARATOR, date_str, SEPARATOR
             )
 
-        # Check if an identical game already exists in the database
-        identical_game = db.find_identical_game(game_instance)
-
-        if identical_game:
-            print(f"ℹ️ Identical game from {game_data['date'].strftime('%d.%m.%Y')} already exists in the database. "
-                  f"Id: {identical_game.get_data()['game_id']}. Skipping.")
-            return False
-
-        # Check if there are any games with the same date in the database
-        existing_game_ids = db.get_game_ids_by_date(game_date)
-        if existing_game_ids:
-            warnings.warn(
-                f"\n{'='*80}\n"
-                f"WARNING: Database already contains {len(existing_game_ids)} game(s) with date {game_date.strftime('%d.%m.%Y')}!\n"
-                f"Game ID(s): {', '.join(map(str, existing_game_ids))}\n"
-                f"Please verify if this is a duplicate or a legitimate new game.\n"
-                f"{'='*80}",
-                UserWarning
-            )
-
-        # Save the data
-        success = db.add_game(game_instance)
+        # Duplicate check and insert share one session and transaction
+        try:
+            scope = db.savepoint(session) if session is not None else db.session_scope()
+            with scope as session:
+                # Check if an identical game already exists in the database
+                identical_game = db.find_identical_game(game_instance, session=session)
+
+                if identical_game:
+                    logger.info("ℹ️ Identical game from %s already exists in the database. Id: %s. Skipping.",
+                                date_str, identical_game.get_data()['game_id'])
+                    return False
+
+                # Check if there are any games with the same date in the database
+                existing_game_ids = db.get_game_ids_by_date(game_date, session=session)
+                if existing_game_ids:
+                    logger.warning(
+                        "\n%s\n"
+                        "WARNING: Database already contains %d game(s) with date %s!\n"
+                        "Game ID(s): %s\n"
+                        "Please verify if this is a duplicate or a legitimate new game.\n"
+                        "%s",
+                        SEPARATOR, len(existing_game_ids), date_str, ', '.join(map(str, existing_game_ids)), SEPARATOR
+                    )
+
+                # Save the data
+                db.add_game(game_instance, session=session)
+            success = True
+        except Exception as e:
+            logger.error("Error adding game data: %s", e, exc_info=True)
+            success = False
 
         # Display success/error message
         if success:
-            print(f"✅ Data for game from {game_data['date'].strftime('%d.%m.%Y')} successfully saved to database")
+            if log_success:
+                logger.info("✅ Data for game from %s successfully saved to database", date_str)
             return True
         else:
-            print(f"❌ Error saving game from {game_data['date'].strftime('%d.%m.%Y')} to database")
+            logger.error("❌ Error saving game from %s to database", date_str)
             return False
     except Exception as e:
-        print(f"❌ Database error: {e}")
+        logger.error("❌ Database error: %s", e)
         return False
+
+
+def save_games_to_database(game_instances, db):
+    """
+    Saves several games to the database in one transaction.
+
+    Every game is saved in its own savepoint, so a duplicate or a failed game
+    doesn't prevent the others from being saved, and all of them are committed once.
+
+    Args:
+        game_instances (list): BdGame instances containing parsed data
+        db: Database object for saving data
+
+    Returns:
+        int: Number of games saved to the database
+    """
+    try:
+        with db.session_scope() as session:
+            saved_games = [game_instance for game_instance in game_instances
+                           if save_game_to_database(game_instance, db, session=session, log_success=False)]
+    except Exception as e:
+        logger.error("❌ Error committing games to database: %s", e)
+        return 0
+
+    # Reported only after the commit, since a failed commit saves none of the games
+    for game_instance in saved_games:
+        logger.info("✅ Data for game from %s successfully saved to database",
+                    _game_date(game_instance).strftime('%d.%m.%Y'))
+    return len(saved_games)
@@ -1,86 +1,102 @@
-import matplotlib.pyplot as plt
+import numpy as np
 from datetime import datetime, timedelta
-from sqlalchemy import and_
+from functools import lru_cache
+from sqlalchemy import select, case, func
 
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
-from db import Database, TeamGameScore
-from db_helpers import normalize_team_name
+from db import TeamGameScore
+from db_helpers import get_database, normalize_team_name
 
+# Rendering settings for long series of games
+PLOT_RC_PARAMS = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
 
-def evaluate_four_bucket_strategy(team_name):
-    """Calculate team performance data with and without last round"""
 
+@lru_cache(maxsize=64)
+def _load_places(normalized_team_name, since_date):
+    """
+    Load places of the team in all games since the given date.
+
+    Results are cached per (team, date), so repeated runs on the same day
+    don't query the database again.
+
+    Args:
+        normalized_team_name (str): Normalized team name
+        since_date (date): Date of the earliest game to include
+
+    Returns:
+        tuple: (game_date, place_with_last, place_without_last) tuples ordered by game date
+    """
     # Connect to database
-    db = Database()
+    db = get_database()
+
+    # Score of a team without last round (mot)
+    score_without_mot = (
+        func.coalesce(TeamGameScore.vybor_points, 0) +
+        func.coalesce(TeamGameScore.chisla_points, 0) +
+        func.coalesce(TeamGameScore.pref_points, 0) +
+        func.coalesce(TeamGameScore.pairs_points, 0) +
+        func.coalesce(TeamGameScore.razobl_points, 0) +
+        func.coalesce(TeamGameScore.auction_points, 0)
+    )
+    total_score = func.coalesce(TeamGameScore.total_points, 0)
+
+    # For target team - exclude mot points, for other teams - include all points
+    score_if_target_skips_mot = case(
+        (TeamGameScore.team_name == normalized_team_name, score_without_mot),
+        else_=total_score
+    )
+
+    # Places of every team in its game, computed by the database
+    ranked_scores = select(
+        TeamGameScore.game_id,
+        TeamGameScore.game_date,
+        TeamGameScore.team_name,
+        func.rank().over(
+            partition_by=TeamGameScore.game_id, order_by=total_score.desc()
+        ).label('place_with_last'),
+        func.rank().over(
+            partition_by=TeamGameScore.game_id, order_by=score_if_target_skips_mot.desc()
+        ).label('place_without_last'),
+    ).where(
+        TeamGameScore.game_date >= since_date
+    ).subquery()
+
+    with db.Session() as session:
+        # Get places of target team in all games since the date
+        rows = session.execute(
+            select(
+                ranked_scores.c.game_date,
+                ranked_scores.c.place_with_last,
+                ranked_scores.c.place_without_last
+            ).where(
+                ranked_scores.c.team_name == normalized_team_name
+            ).order_by(ranked_scores.c.game_date, ranked_scores.c.game_id)
+        ).all()
+
+    # Immutable result, safe to share between cached calls
+    return tuple(tuple(row) for row in rows)
+
+
+def evaluate_four_bucket_strategy(team_name):
+    """Calculate team performance data with and without last round"""
 
     # Normalize team name for database comparison
     normalized_team_name = normalize_team_name(team_name)
 
     # Get games from the last year
-    one_year_ago = datetime.now() - timedelta(days=365)
+    one_year_ago = (datetime.now() - timedelta(days=365)).date()
 
-    with db.Session() as session:
-        # Get all games with target team from last year
-        games_with_team = session.query(TeamGameScore).filter(
-            and_(
-                TeamGameScore.game_date >= one_year_ago,
-                TeamGameScore.team_name == normalized_team_name
-            )
-        ).order_by(TeamGameScore.game_date).all()
-
-        dates = []
-        places_with_last = []
-        places_without_last = []
-
-        for target_team_score in games_with_team:
-            game_id = target_team_score.game_id
-            game_date = target_team_score.game_date
-
-            # Get all teams for this game
-            all_teams = session.query(TeamGameScore).filter(
-                TeamGameScore.game_id == game_id
-            ).all()
-
-            # Calculate places with all rounds (normal results)
-            teams_with_last = []
-            for team in all_teams:
-                total_score = float(team.total_points or 0)
-                teams_with_last.append((team.team_name, total_score))
-
-            # Sort by score descending
-            teams_with_last.sort(key=lambda x: x[1], reverse=True)
-            place_with_last = next(i + 1 for i, (name, _) in enumerate(teams_with_last)
-                                  if name == normalized_team_name)
-
-            # Calculate places without last round (mot)
-            teams_without_last = []
-            for team in all_teams:
-                if team.team_name == normalized_team_name:
-                    # For target team - exclude mot points
-                    total_score = (
-                        float(team.vybor_points or 0) +
-                        float(team.chisla_points or 0) +
-                        float(team.pref_points or 0) +
-                        float(team.pairs_points or 0) +
-                        float(team.razobl_points or 0) +
-                        float(team.auction_points or 0)
-                    )
-                else:
-                    # For other teams - include all points
-                    total_score = float(team.total_points or 0)
-
-                teams_without_last.append((team.team_name, total_score))
-
-            # Sort by score descending
-            teams_without_last.sort(key=lambda x: x[1], reverse=True)
-            place_without_last = next(i + 1 for i, (name, _) in enumerate(teams_without_last)
-                                     if name == normalized_team_name)
-
-            dates.append(game_date)
-            places_with_last.append(place_with_last)
-            places_without_last.append(place_without_last)
+    rows = _load_places(normalized_team_name, one_year_ago)
+
+    dates = [game_date for game_date, _, _ in rows]
+    places_with_last = [place for _, place, _ in rows]
+    places_without_last = [place for _, _, place in rows]
 
     return dates, places_with_last, places_without_last
 
@@ -91,75 +107,75 @@ def visualize_results(dates, places_with_last, places_without_last, team_name):
         print(f"No games found for '{team_name}' in the last year")
         return
 
+    # Imported here so that computing stats alone doesn't load matplotlib
+    import matplotlib.pyplot as plt
+
     # Calculate difference (positive = better without last round)
-    place_differences = [with_last - without_last for with_last, without_last in
-                        zip(places_with_last, places_without_last)]
+    place_differences = np.asarray(places_with_last) - np.asarray(places_without_last)
 
     # Create common x positions
     x_positions = range(len(dates))
     date_labels = [date.strftime('%d.%m') for date in dates]
 
-    # Create subplot layout
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-
-    # Plot 1: Difference bar chart
-    colors = ['green' if diff > 0 else 'red' if diff < 0 else 'gray'
-              for diff in place_differences]
-
-    # Use explicit x positions for bars
-    bars = ax1.bar(x_positions, place_differences, color=colors, alpha=0.7, width=0.8)
-    ax1.axhline(y=0, color='black', linestyle='-', alpha=0.3)
-    ax1.set_ylabel('Разность мест')
-    ax1.set_title(f'Выгода от сохранения баллов в последнем раунде - "{team_name}"')
-    ax1.grid(True, alpha=0.3)
-
-    # Add value labels on bars
-    for i, (bar, diff) in enumerate(zip(bars, place_differences)):
-        if diff != 0:
-            ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + (0.1 if diff > 0 else -0.1),
-                    f'{diff:+d}', ha='center', va='bottom' if diff > 0 else 'top')
-
-    # Set x-axis for bar chart
-    ax1.set_xlim(-0.5, len(dates) - 0.5)
-    ax1.set_xticks(x_positions)
-    ax1.set_xticklabels(date_labels, rotation=45)
-
-    # Plot 2: Original lines - use same x positions
-    ax2.plot(x_positions, places_with_last, 'b-', label='Реальные места',
-             linewidth=2, marker='o')
-    ax2.plot(x_positions, places_without_last, 'r-', label='Без ставок в последнем раунде',
-             linewidth=2, marker='s')
-    ax2.set_xlabel('Игры')
-    ax2.set_ylabel('Место команды')
-    ax2.set_title('Места в играх')
-    ax2.legend()
-    ax2.grid(True, alpha=0.3)
-    ax2.invert_yaxis()
-
-    # Set x-axis for line chart - same as bar chart
-    ax2.set_xlim(-0.5, len(dates) - 0.5)
-    ax2.set_xticks(x_positions)
-    ax2.set_xticklabels(date_labels, rotation=45)
-
-    plt.tight_layout()
-
-    # Statistics
-    positive_games = sum(1 for diff in place_differences if diff > 0)
-    negative_games = sum(1 for diff in place_differences if diff < 0)
-    zero_games = sum(1 for diff in place_differences if diff == 0)
-
-    print(f"\nАнализ {len(dates)} игр:")
-    print(f"Выгодно сохранить баллы: {positive_games} игр ({positive_games/len(dates)*100:.1f}%)")
-    print(f"Невыгодно сохранять баллы: {negative_games} игр ({negative_games/len(dates)*100:.1f}%)")
-    print(f"Без разницы: {zero_games} игр ({zero_games/len(dates)*100:.1f}%)")
-
-    avg_benefit = sum(place_differences) / len(place_differences)
-    print(f"Средняя выгода: {avg_benefit:+.2f} мест")
-
-    # Save and show
-    png_filename = '4_bucket_strategy_analysis_on_team.png'
-    plt.savefig(png_filename, dpi=300, bbox_inches='tight')
-    plt.show()
+    # Let matplotlib simplify dense line paths and render them in chunks
+    with plt.rc_context(PLOT_RC_PARAMS):
+        # Create subplot layout
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+
+        # Plot 1: Difference bar chart
+        colors = np.where(place_differences > 0, 'green', np.where(place_differences < 0, 'red', 'gray'))
+
+        # Use explicit x positions for bars
+        bars = ax1.bar(x_positions, place_differences, color=colors, alpha=0.7, width=0.8)
+        ax1.axhline(y=0, color='black', linestyle='-', alpha=0.3)
+        ax1.set_ylabel('Разность мест')
+        ax1.set_title(f'Выгода от сохранения баллов в последнем раунде - "{team_name}"')
+        ax1.grid(True, alpha=0.3)
+
+        # Add value labels on bars
+        ax1.bar_label(bars, labels=[f'{diff:+d}' if diff else '' for diff in place_differences], padding=3)
+
+        # Set x-axis for bar chart
+        ax1.set_xlim(-0.5, len(dates) - 0.5)
+        ax1.set_xticks(x_positions)
+        ax1.set_xticklabels(date_labels, rotation=45)
+
+        # Plot 2: Original lines - use same x positions
+        ax2.plot(x_positions, places_with_last, 'b-', label='Реальные места',
+                 linewidth=2, marker='o')
+        ax2.plot(x_positions, places_without_last, 'r-', label='Без ставок в последнем раунде',
+                 linewidth=2, marker='s')
+        ax2.set_xlabel('Игры')
+        ax2.set_ylabel('Место команды')
+        ax2.set_title('Места в играх')
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+        ax2.invert_yaxis()
+
+        # Set x-axis for line chart - same as bar chart
+        ax2.set_xlim(-0.5, len(dates) - 0.5)
+        ax2.set_xticks(x_positions)
+        ax2.set_xticklabels(date_labels, rotation=45)
+
+        plt.tight_layout()
+
+        # Statistics
+        positive_games = int((place_differences > 0).sum())
+        negative_games = int((place_differences < 0).sum())
+        zero_games = int((place_differences == 0).sum())
+
+        print(f"\nАнализ {len(dates)} игр:")
+        print(f"Выгодно сохранить баллы: {positive_games} игр ({positive_games/len(dates)*100:.1f}%)")
+        print(f"Невыгодно сохранять баллы: {negative_games} игр ({negative_games/len(dates)*100:.1f}%)")
+        print(f"Без разницы: {zero_games} игр ({zero_games/len(dates)*100:.1f}%)")
+
+        avg_benefit = float(place_differences.mean())
+        print(f"Средняя выгода: {avg_benefit:+.2f} мест")
+
+        # Save and show
+        png_filename = '4_bucket_strategy_analysis_on_team.png'
+        plt.savefig(png_filename, dpi=300, bbox_inches='tight')
+        plt.show()
 
     print(f"График сохранен как {png_filename}")
 
@@ -0,0 +1,54 @@
+"""add on delete cascade to game foreign keys
+
+Revision ID: b7c8d9e0f1a2
+Revises: a1b2c3d4e5f6
+Create Date: 2025-10-25 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c8d9e0f1a2'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables whose game_id column references games.game_id
+CHILD_TABLES = ['game_teams', 'vybor', 'chisla', 'pref', 'pairs', 'razobl', 'auction', 'mot']
+
+
+def _recreate_game_fks(ondelete: Union[str, None]) -> None:
+    """Recreate every foreign key pointing to games with the given ON DELETE rule.
+
+    Constraint names were generated by MySQL in the initial migration,
+    so they are looked up via reflection instead of being hardcoded.
+
+    Args:
+        ondelete: ON DELETE action for the new constraints (None for default)
+    """
+    inspector = sa.inspect(op.get_bind())
+    for table in CHILD_TABLES:
+        for fk in inspector.get_foreign_keys(table):
+            if fk['referred_table'] != 'games':
+                continue
+            op.drop_constraint(fk['name'], table, type_='foreignkey')
+            op.create_foreign_key(
+                fk['name'], table, 'games',
+                fk['constrained_columns'], fk['referred_columns'],
+                ondelete=ondelete,
+            )
+
+
+def upgrade() -> None:
+    """Delete contest results together with their game."""
+    _recreate_game_fks('CASCADE')
+
+
+def downgrade() -> None:
+    """Restore plain foreign keys to games."""
+    _recreate_game_fks(None)
@@ -0,0 +1,27 @@
+"""add index on games.game_date
+
+Revision ID: c3d4e5f6a7b8
+Revises: b7c8d9e0f1a2
+Create Date: 2025-10-25 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, None] = 'b7c8d9e0f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index game dates used by duplicate game lookups."""
+    op.create_index('ix_games_game_date', 'games', ['game_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop game date index."""
+    op.drop_index('ix_games_game_date', table_name='games')
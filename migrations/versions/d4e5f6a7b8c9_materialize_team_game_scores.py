@@ -0,0 +1,98 @@
+"""materialize team_game_scores as a table
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2025-10-26 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Body of the former team_game_scores view, used both to backfill the table
+# and to recreate the view on downgrade
+TEAM_GAME_SCORES_SELECT = """
+    SELECT
+        g.game_id,
+        g.game_date,
+        t.team_id,
+        t.team_name,
+        vybor.points AS vybor_points,
+        chisla.total_sum AS chisla_points,
+        pref.total_sum AS pref_points,
+        pairs.points AS pairs_points,
+        razobl.total_sum AS razobl_points,
+        auction.total_sum AS auction_points,
+        mot.total_sum AS mot_points,
+        (
+            COALESCE(vybor.points, 0) +
+            COALESCE(chisla.total_sum, 0) +
+            COALESCE(pref.total_sum, 0) +
+            COALESCE(pairs.points, 0) +
+            COALESCE(razobl.total_sum, 0) +
+            COALESCE(auction.total_sum, 0) +
+            COALESCE(mot.total_sum, 0)
+        ) AS total_points
+    FROM games g
+    JOIN game_teams gt ON g.game_id = gt.game_id
+    JOIN teams t ON gt.team_id = t.team_id
+    LEFT JOIN vybor ON (g.game_id = vybor.game_id AND t.team_id = vybor.team_id)
+    LEFT JOIN chisla ON (g.game_id = chisla.game_id AND t.team_id = chisla.team_id)
+    LEFT JOIN pref ON (g.game_id = pref.game_id AND t.team_id = pref.team_id)
+    LEFT JOIN pairs ON (g.game_id = pairs.game_id AND t.team_id = pairs.team_id)
+    LEFT JOIN razobl ON (g.game_id = razobl.game_id AND t.team_id = razobl.team_id)
+    LEFT JOIN auction ON (g.game_id = auction.game_id AND t.team_id = auction.team_id)
+    LEFT JOIN mot ON (g.game_id = mot.game_id AND t.team_id = mot.team_id)
+"""
+
+
+def upgrade() -> None:
+    """Replace team_game_scores view with a table filled on game insert."""
+    op.execute("DROP VIEW IF EXISTS team_game_scores")
+    op.create_table('team_game_scores',
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('game_date', sa.Date(), nullable=False),
+    # Same binary collation as teams.team_name for exact matching
+    sa.Column('team_name', sa.String(length=256, collation='utf8mb4_bin'), nullable=False),
+    sa.Column('vybor_points', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('chisla_points', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('pref_points', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('pairs_points', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('razobl_points', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('auction_points', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('mot_points', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('total_points', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['games.game_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.team_id'], ),
+    sa.PrimaryKeyConstraint('game_id', 'team_id')
+    )
+    op.create_index('ix_team_game_scores_game_date', 'team_game_scores', ['game_date'], unique=False)
+    op.create_index('ix_team_game_scores_team_name', 'team_game_scores', ['team_name'], unique=False)
+
+    # Backfill scores of already stored games
+    op.execute(f"""
+        INSERT INTO team_game_scores (
+            game_id, game_date, team_id, team_name,
+            vybor_points, chisla_points, pref_points, pairs_points,
+            razobl_points, auction_points, mot_points, total_points
+        )
+        {TEAM_GAME_SCORES_SELECT}
+    """)
+
+
+def downgrade() -> None:
+    """Restore team_game_scores view."""
+    op.drop_index('ix_team_game_scores_team_name', table_name='team_game_scores')
+    op.drop_index('ix_team_game_scores_game_date', table_name='team_game_scores')
+    op.drop_table('team_game_scores')
+    op.execute(f"CREATE VIEW team_game_scores AS {TEAM_GAME_SCORES_SELECT}")
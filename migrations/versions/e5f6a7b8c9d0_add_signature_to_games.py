@@ -0,0 +1,66 @@
+"""add signature to games
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2025-10-26 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _signature(game_date, totals) -> str:
+    """Same algorithm as db.game_signature at the time of this revision."""
+    payload = {
+        'date': game_date.isoformat(),
+        'teams': sorted(
+            [name, str(Decimal(str(total)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))]
+            for name, total in totals.items()
+        ),
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def upgrade() -> None:
+    """Add indexed games.signature and fill it for existing games."""
+    op.add_column('games', sa.Column('signature', sa.String(length=64), nullable=True))
+    op.create_index('ix_games_signature', 'games', ['signature'], unique=False)
+
+    # Backfill from stored team totals
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT game_id, game_date, team_name, total_points FROM team_game_scores"
+    )).fetchall()
+
+    games = defaultdict(dict)
+    game_dates = {}
+    for game_id, game_date, team_name, total_points in rows:
+        games[game_id][team_name] = total_points
+        game_dates[game_id] = game_date
+
+    update = sa.text("UPDATE games SET signature = :signature WHERE game_id = :game_id")
+    params = [
+        {'game_id': game_id, 'signature': _signature(game_dates[game_id], totals)}
+        for game_id, totals in games.items()
+    ]
+    if params:
+        conn.execute(update, params)
+
+
+def downgrade() -> None:
+    """Remove games.signature."""
+    op.drop_index('ix_games_signature', table_name='games')
+    op.drop_column('games', 'signature')
@@ -0,0 +1,34 @@
+"""add file_hash to games
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2025-10-27 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add indexed games.file_hash.
+
+    Source files of existing games are unknown, so their hash stays NULL
+    and they are still recognized by signature on re-import.
+    """
+    op.add_column('games', sa.Column('file_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_games_file_hash', 'games', ['file_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop games.file_hash and its index."""
+    op.drop_index('ix_games_file_hash', table_name='games')
+    op.drop_column('games', 'file_hash')
@@ -1,28 +1,74 @@
 import argparse
+import hashlib
 import os
-from bd_game import BdGame
-from db_helpers import initialize_database, save_game_to_database
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from bd_game import BdGame, file_sha256
+from db_helpers import initialize_database, save_games_to_database
 
+# Directory for cached parse results (used with --cache)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'parsed_xlsm')
+# Bump when the parsed data structure changes to invalidate old cache entries
+CACHE_VERSION = 2
 
-def parse_xlsm(file_path):
+
+def _cache_path(file_path, cache_dir):
+    """
+    Build the cache file path for an XLSM file.
+
+    The key depends on the file path, modification time and size,
+    so a changed file is parsed again.
+
+    Args:
+        file_path (str): Path to the XLSM file
+        cache_dir (str): Directory with cached results
+
+    Returns:
+        str: Path to the pickle file
+    """
+    stat = os.stat(file_path)
+    key = f"{CACHE_VERSION}:{os.path.abspath(file_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    return os.path.join(cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pkl')
+
+
+def parse_xlsm(file_path, cache_dir=None, file_hash=None):
     """
     Parse a single XLSM file using the new BdGame paradigm.
 
     Args:
         file_path (str): Path to the XLSM file
+        cache_dir (str, optional): Directory for cached parse results, caching is disabled if None
+        file_hash (str, optional): SHA-256 of the file if already computed, so it isn't read again
 
     Returns:
         BdGame or None: Parsed game instance or None if parsing failed
     """
+    cache_path = _cache_path(file_path, cache_dir) if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring broken cache entry for {file_path}: {e}")
+
     # Create a new BdGame instance
     game = BdGame()
 
     # Parse the file using the object's method
-    if game.parse_from_file(file_path):
-        return game
-    else:
+    if not game.parse_from_file(file_path, file_hash=file_hash):
         return None
 
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so parallel runs never see a partial entry
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(game, f, protocol=5)
+        os.replace(tmp_path, cache_path)
+
+    return game
+
 
 # Main code to get the list of files from the command line
 if __name__ == "__main__":
@@ -30,14 +76,20 @@ if __name__ == "__main__":
     parser.add_argument('directory', type=str, help='Path to the directory containing XLSM files')
     parser.add_argument('--no-save', action='store_true', help='Do not save data to database')
     parser.add_argument('-v', '--verbose', action='store_true', help='Display detailed parsing results')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='Number of files parsed in parallel (default: number of CPUs)')
+    parser.add_argument('--cache', action='store_true',
+                        help=f'Reuse parse results of unchanged files (stored in {CACHE_DIR})')
 
     args = parser.parse_args()
 
     # Get the directory path from the command line arguments
     directory_path = args.directory
 
-    # List all .xlsm files in the directory
-    xlsm_files = [f for f in os.listdir(directory_path) if f.endswith('.xlsm')]
+    # List all .xlsm files in the directory, DirEntry provides name, path and type from one directory scan
+    with os.scandir(directory_path) as entries:
+        xlsm_entries = [entry for entry in entries if entry.name.endswith('.xlsm') and entry.is_file()]
+    xlsm_files = [entry.name for entry in xlsm_entries]
 
     if not xlsm_files:
         print(f"No XLSM files found in directory: {directory_path}")
@@ -55,40 +107,71 @@ if __name__ == "__main__":
     # Process each file
     successful_parses = 0
     successful_saves = 0
+    skipped_files = 0
+    parsed_games = []
+
+    file_paths = [entry.path for entry in xlsm_entries]
+    # Without a database hashes are computed by the parser itself
+    files_to_parse = [(xlsm_file, file_path, None) for xlsm_file, file_path in zip(xlsm_files, file_paths)]
+
+    # Skip files whose games are already in the database before parsing them
+    if db:
+        file_hashes = [file_sha256(file_path) for file_path in file_paths]
+        imported_hashes = db.get_imported_file_hashes(file_hashes)
+        files_to_parse = []
+        for xlsm_file, file_path, file_hash in zip(xlsm_files, file_paths, file_hashes):
+            if file_hash in imported_hashes:
+                print(f"ℹ️ Already imported, skipping: {xlsm_file}")
+                skipped_files += 1
+            else:
+                # The hash is passed on, so the parser doesn't read the file again to compute it
+                files_to_parse.append((xlsm_file, file_path, file_hash))
+
+    jobs = max(1, min(args.jobs or 1, len(files_to_parse)))
+    parse_file = partial(parse_xlsm, cache_dir=CACHE_DIR if args.cache else None)
+
+    # Files are parsed in worker processes, while saving stays in the main process
+    # because database connections can't be shared between processes
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        if jobs > 1:
+            futures = [executor.submit(parse_file, file_path, file_hash=file_hash)
+                       for _, file_path, file_hash in files_to_parse]
+            results = (future.result() for future in futures)
+        else:
+            results = (parse_file(file_path, file_hash=file_hash) for _, file_path, file_hash in files_to_parse)
 
-    for xlsm_file in xlsm_files:
-        file_path = os.path.join(directory_path, xlsm_file)
-        print(f"\nProcessing: {xlsm_file}")
+        for (xlsm_file, _, _), game_instance in zip(files_to_parse, results):
+            print(f"\nProcessing: {xlsm_file}")
 
-        # Parse the file using the new paradigm
-        game_instance = parse_xlsm(file_path)
+            if game_instance:
+                successful_parses += 1
 
-        if game_instance:
-            successful_parses += 1
+                # Display detailed results if verbose mode is enabled
+                if args.verbose:
+                    game_instance.print_detailed()
 
-            # Display detailed results if verbose mode is enabled
-            if args.verbose:
-                game_instance.print_detailed()
+                parsed_games.append(game_instance)
+            else:
+                print(f"❌ Failed to parse: {xlsm_file}")
 
-            # Save to database if not disabled
-            if not args.no_save and db:
-                if save_game_to_database(game_instance, db):
-                    successful_saves += 1
-        else:
-            print(f"❌ Failed to parse: {xlsm_file}")
+    # Save all parsed games in one transaction if not disabled
+    if not args.no_save and db and parsed_games:
+        successful_saves = save_games_to_database(parsed_games, db)
 
     # Print summary
     print(f"\n{'='*60}")
     print(f"SUMMARY")
     print(f"{'='*60}")
     print(f"Files processed: {len(xlsm_files)}")
+    if skipped_files:
+        print(f"Skipped (already imported): {skipped_files}")
     print(f"Successfully parsed: {successful_parses}")
 
     if not args.no_save:
         print(f"Successfully saved to database: {successful_saves}")
 
-    if successful_parses < len(xlsm_files):
-        print(f"Failed to parse: {len(xlsm_files) - successful_parses}")
+    if successful_parses < len(files_to_parse):
+        print(f"Failed to parse: {len(files_to_parse) - successful_parses}")
 
     if not args.no_save and successful_saves < successful_parses:
         print(f"Failed to save: {successful_parses - successful_saves}")
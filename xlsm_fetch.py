@@ -12,12 +12,15 @@ Usage:
 """
 
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from xlsm_fetch import SeleniumFetcher, ApiFetcher, GdownFetcher
 from config import XLSM_FETCH_CONFIG
-from bd_game import BdGame
-from db_helpers import initialize_database, save_game_to_database
+from parse_data import parse_xlsm
+from bd_game import file_sha256
+from db_helpers import initialize_database, save_games_to_database
 
 # Constants
 PROJECT_ROOT = Path(__file__).parent.resolve()
@@ -30,32 +33,38 @@ def load_config() -> dict:
 
     return XLSM_FETCH_CONFIG
 
+# Fetcher factories by mode: (folder_url, cfg, headless) -> fetcher
+FETCHERS = {
+    'browser_selenium': lambda folder_url, cfg, headless: SeleniumFetcher(
+        folder_url, cfg.get('download_dir'), headless=headless, debug=cfg.get('debug', False)),
+    'public_api': lambda folder_url, cfg, headless: ApiFetcher(
+        folder_url, cfg.get('download_dir'), cfg.get('google_api_key'), cfg.get('google_access_token'),
+        concurrency_safe=cfg.get('concurrency_safe', True)),
+    'gdown': lambda folder_url, cfg, headless: GdownFetcher(folder_url, cfg.get('download_dir')),
+}
+
 def create_fetcher(mode: str, folder_url: str, cfg: dict | None = None, headless: bool = True):
     """Create appropriate fetcher based on mode.
 
-    If cfg is provided and mode == 'public_api', read 'google_api_key' and
-    'google_access_token' from it and pass to ApiFetcher.
+    download_dir is read from cfg for every mode. If mode == 'public_api',
+    'google_api_key', 'google_access_token' and 'concurrency_safe' are read from cfg and passed to ApiFetcher.
     """
-    # Extract download_dir from config (may be None)
-    download_dir = cfg.get('download_dir') if cfg else None
-
-    if mode == 'browser_selenium':
-        return SeleniumFetcher(folder_url, download_dir, headless=headless)
-    elif mode == 'public_api':
-        api_key = cfg.get('google_api_key') if cfg else None
-        access_token = cfg.get('google_access_token') if cfg else None
-        return ApiFetcher(folder_url, download_dir, api_key, access_token)
-    elif mode == 'gdown':
-        return GdownFetcher(folder_url, download_dir)
-    else:
+    try:
+        factory = FETCHERS[mode]
+    except KeyError:
         raise ValueError(f"Unknown mode: {mode}")
+    return factory(folder_url, cfg or {}, headless)
 
-def process_downloaded_files(files, download_dir):
+def process_downloaded_files(files, download_dir, jobs=None):
     """Process downloaded .xlsm files by parsing and saving to database.
 
+    Files are parsed in parallel worker processes, all parsed games are then saved
+    in the main process in one transaction.
+
     Args:
         files: List of file names (strings) from fetcher
         download_dir: Directory where files were downloaded
+        jobs: Number of files parsed in parallel (default: number of CPUs)
 
     Returns:
         tuple: (successful_parses, successful_saves)
@@ -76,46 +85,73 @@ def process_downloaded_files(files, download_dir):
 
     successful_parses = 0
     successful_saves = 0
+    skipped_files = 0
+    missing_files = 0
+    parsed_games = []
 
+    # Resolve local paths of the downloaded files
+    file_names = []
     for file_name in files:
         # Handle both string filenames and dict objects
         if isinstance(file_name, dict):
             file_name = file_name.get('name', 'unknown')
-
-        file_path = Path(download_dir) / file_name
-
-        print(f"\nProcessing: {file_name}")
-
-        # Check if file exists locally
-        if not file_path.exists():
-            print(f"❌ File not found locally: {file_path}")
-            continue
-
-        # Create BdGame instance and parse file
-        game = BdGame()
-
-        if game.parse_from_file(str(file_path)):
-            successful_parses += 1
-            print(f"✅ Successfully parsed: {file_name}")
-
-            # Save to database
-            if save_game_to_database(game, db):
-                successful_saves += 1
+        file_names.append(file_name)
+
+    file_paths = [str(Path(download_dir) / file_name) for file_name in file_names]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(file_paths)))
+
+    # Database connections can't be shared between processes, so only parsing runs in workers
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Check if files exist locally and skip already imported ones before submitting them for parsing
+        file_hashes = [file_sha256(file_path) if Path(file_path).exists() else None for file_path in file_paths]
+        imported_hashes = db.get_imported_file_hashes(file_hash for file_hash in file_hashes if file_hash)
+        # Hashes computed for the check are passed on, so workers don't read the files again
+        futures = [executor.submit(parse_xlsm, file_path, file_hash=file_hash)
+                   if file_hash and file_hash not in imported_hashes else None
+                   for file_path, file_hash in zip(file_paths, file_hashes)]
+
+        for file_name, file_path, file_hash, future in zip(file_names, file_paths, file_hashes, futures):
+            print(f"\nProcessing: {file_name}")
+
+            if file_hash is None:
+                print(f"❌ File not found locally: {file_path}")
+                missing_files += 1
+                continue
+
+            if future is None:
+                print(f"ℹ️ Already imported, skipping: {file_name}")
+                skipped_files += 1
+                continue
+
+            game = future.result()
+
+            if game:
+                successful_parses += 1
+                print(f"✅ Successfully parsed: {file_name}")
+                parsed_games.append(game)
             else:
-                print(f"⚠️ Failed to save to database: {file_name}")
-        else:
-            print(f"❌ Failed to parse: {file_name}")
+                print(f"❌ Failed to parse: {file_name}")
+
+    # Save all parsed games in one transaction
+    if parsed_games:
+        successful_saves = save_games_to_database(parsed_games, db)
 
     # Print summary
     print(f"\n{'='*60}")
     print(f"PROCESSING SUMMARY")
     print(f"{'='*60}")
     print(f"Files processed: {len(files)}")
+    if missing_files:
+        print(f"Not found locally: {missing_files}")
+    if skipped_files:
+        print(f"Skipped (already imported): {skipped_files}")
     print(f"Successfully parsed: {successful_parses}")
     print(f"Successfully saved to database: {successful_saves}")
 
-    if successful_parses < len(files):
-        print(f"Failed to parse: {len(files) - successful_parses}")
+    # Only files submitted for parsing can fail to parse
+    parsed_files = len(files) - missing_files - skipped_files
+    if successful_parses < parsed_files:
+        print(f"Failed to parse: {parsed_files - successful_parses}")
 
     if successful_saves < successful_parses:
         print(f"Failed to save: {successful_parses - successful_saves}")
@@ -127,11 +163,13 @@ def main():
     parser = argparse.ArgumentParser(description="Fetch .xlsm files from Google Drive and process them")
     parser.add_argument(
         '--mode',
-        choices=['browser_selenium', 'public_api', 'gdown'],
+        choices=list(FETCHERS),
         help='Force specific fetching mode (overrides config)'
     )
     parser.add_argument('--no-headless', action='store_true', help='Disable headless mode for browser_selenium')
     parser.add_argument('--fetch-only', action='store_true', help='Only fetch files, do not parse and save to database')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help='Number of files parsed in parallel (default: number of CPUs)')
     args = parser.parse_args()
 
     # Load configuration
@@ -187,7 +225,7 @@ def main():
 
     # Process files unless --fetch-only is specified
     if not args.fetch_only:
-        process_downloaded_files(files, download_dir)
+        process_downloaded_files(files, download_dir, jobs=args.jobs)
     else:
         print(f"Fetch complete. Files available in: {download_dir}")
 
@@ -1,12 +1,60 @@
 """API-based fetcher for Google Drive files."""
 
 from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import hashlib
 import os
 import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .base_fetcher import BaseFetcher
 
+# common folder URL patterns (/folders/<id>, ?id=<id>, /file/d/<id>) in one expression
+_FOLDER_ID_RE = re.compile(r"(?:/folders/|[?&]id=|/file/d/)(?P<id>[a-zA-Z0-9_-]+)")
+# a raw folder id without URL
+_RAW_ID_RE = re.compile(r"[a-zA-Z0-9_-]+")
+# case-insensitive .xlsm suffix, matched without lowercasing every name
+_XLSM_RE = re.compile(r"\.xlsm\Z", re.IGNORECASE)
+
+# HTTP session of each thread, shared by all ApiFetcher instances, so pooled connections
+# survive between fetches (e.g. several folders or modes in one process).
+# requests.Session isn't thread-safe, so download workers get their own;
+# a session goes away together with its thread
+_sessions = threading.local()
+
+
+def _make_session() -> requests.Session:
+    """Create an HTTP session that keeps connections to the Drive API open between requests.
+
+    Transient errors (rate limiting and 5xx) are retried by the adapter with exponential backoff.
+    The session holds no credentials, they are passed with each request.
+    """
+    session = requests.Session()
+    # A retry re-sends the same request, so the current pageToken is kept and no page is skipped
+    retries = Retry(
+        total=6,
+        backoff_factor=0.5,
+        backoff_max=60,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        # Return the last response instead of raising, fetch() reports the status
+        raise_on_status=False,
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retries))
+    return session
+
+
+def _get_session() -> requests.Session:
+    """Return the HTTP session of the current thread, creating it on first use."""
+    session = getattr(_sessions, 'session', None)
+    if session is None:
+        session = _sessions.session = _make_session()
+    return session
+
 
 class ApiFetcher(BaseFetcher):
     """Fetcher that uses the Google Drive REST API.
@@ -17,11 +65,17 @@ class ApiFetcher(BaseFetcher):
     - no credentials provided -> attempts an unauthenticated request (may be rejected)
 
     Pagination: iterates through all pages using nextPageToken.
+    Listed files are downloaded in parallel into download_dir.
     """
 
     DRIVE_FILES_ENDPOINT = "https://www.googleapis.com/drive/v3/files"
+    XLSM_MIME_TYPE = "application/vnd.ms-excel.sheet.macroEnabled.12"
+    # parallel downloads, kept low to stay within Drive per-user rate limits
+    DOWNLOAD_WORKERS = 8
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
-    def __init__(self, folder_url: str, download_dir: Optional[str] = None, api_key: Optional[str] = None, access_token: Optional[str] = None):
+    def __init__(self, folder_url: str, download_dir: Optional[str] = None, api_key: Optional[str] = None, access_token: Optional[str] = None,
+                 concurrency_safe: bool = True):
         """Initialize with Google Drive folder URL and optional credentials.
 
         Args:
@@ -29,10 +83,17 @@ class ApiFetcher(BaseFetcher):
             download_dir: optional download directory path.
             api_key: optional API key for public requests.
             access_token: optional OAuth2 access token (Bearer) for authenticated requests.
+            concurrency_safe: download files in parallel; set to False when the network
+                (e.g. a proxy) can't handle parallel connections and downloads hang.
         """
         super().__init__(folder_url, download_dir)
         self.api_key = api_key
         self.access_token = access_token
+        self.concurrency_safe = concurrency_safe
+        # folder_url doesn't change after construction, parse it once
+        self._folder_id = self._extract_folder_id()
+        # Sessions are shared with other instances, so the token goes with each request
+        self._headers = {'Authorization': f"Bearer {access_token}"} if access_token else {}
 
     def _extract_folder_id(self) -> Optional[str]:
         """Extract Google Drive folder id from the provided folder_url.
@@ -42,66 +103,85 @@ class ApiFetcher(BaseFetcher):
         if not self.folder_url:
             return None
 
-        # common patterns
-        patterns = [
-            r"/folders/([a-zA-Z0-9_-]+)",
-            r"[?&]id=([a-zA-Z0-9_-]+)",
-            r"/file/d/([a-zA-Z0-9_-]+)"
-        ]
-
-        for pat in patterns:
-            m = re.search(pat, self.folder_url)
-            if m:
-                return m.group(1)
+        m = _FOLDER_ID_RE.search(self.folder_url)
+        if m:
+            return m['id']
 
         # fallback: maybe the entire URL is just an id
-        if re.fullmatch(r"[a-zA-Z0-9_-]+", self.folder_url):
+        if _RAW_ID_RE.fullmatch(self.folder_url):
             return self.folder_url
 
         return None
 
     def fetch(self) -> List[str]:
-        """Fetch list of .xlsm files using the Google Drive API.
+        """Fetch .xlsm files using the Google Drive API.
 
         Uses access_token (Bearer) if provided, otherwise api_key if provided, or an unauthenticated
-        request as a last resort. Iterates through all pages and returns files matching '.xlsm'.
+        request as a last resort. Iterates through all pages to list files matching '.xlsm' and
+        downloads them into download_dir in parallel.
 
         Returns:
             List[str] - list of file names that were downloaded/added
         """
         self._log(f"Starting API fetch from: {self.folder_url}")
 
-        folder_id = self._extract_folder_id()
+        folder_id = self._folder_id
         if not folder_id:
             self._log("Could not extract folder id from folder_url")
             return []
 
-        params = {
-            # list children of folder, skip trashed
-            'q': f"'{folder_id}' in parents and trashed=false",
-            'fields': 'nextPageToken, files(id, name, mimeType, size)',
-            'pageSize': 1000,
-        }
-
-        headers = {}
+        # parameters shared by listing and download requests
+        auth_params: Dict[str, str] = {'supportsAllDrives': 'true'}
         if self.access_token:
-            headers['Authorization'] = f"Bearer {self.access_token}"
             self._log("Using provided access_token for Authorization: Bearer <token>")
         elif self.api_key:
-            params['key'] = self.api_key
+            auth_params['key'] = self.api_key
             self._log("Using provided api_key for requests")
         else:
             self._log("No credentials provided; attempting unauthenticated requests (may fail)")
 
-        files: List[str] = []
+        listed_files = self._list_files(folder_id, auth_params)
+        self._log(f"Found {len(listed_files)} .xlsm files, downloading to {self.download_dir}")
+
+        files = self._download_files(listed_files, auth_params)
+        self._log(f"API fetch completed. Downloaded {len(files)} of {len(listed_files)} .xlsm files")
+        return files
+
+    def _list_files(self, folder_id: str, auth_params: Dict[str, str]) -> List[Dict]:
+        """List .xlsm files in the folder, following nextPageToken through all pages.
+
+        Args:
+            folder_id: Google Drive folder id.
+            auth_params: query parameters with credentials.
+
+        Returns:
+            List[Dict] - file entries (id, name, size, md5Checksum); on errors, the entries listed so far
+        """
+        params = {
+            **auth_params,
+            # list .xlsm children of folder, skip trashed; filtering on the server means fewer pages
+            'q': (f"'{folder_id}' in parents and trashed=false and "
+                  f"(name contains '.xlsm' or mimeType='{self.XLSM_MIME_TYPE}')"),
+            # only fields used below, smaller pages to transfer and parse;
+            # size and md5Checksum are all the download needs, no per-file metadata request
+            'fields': 'nextPageToken, files(id, name, size, md5Checksum)',
+            'pageSize': 1000,
+            # without this, folders on shared drives come back empty
+            'includeItemsFromAllDrives': 'true',
+            # stable order between pages
+            'orderBy': 'name',
+        }
+
+        files: List[Dict] = []
         next_token: Optional[str] = None
+        session = _get_session()
 
         try:
             while True:
                 if next_token:
                     params['pageToken'] = next_token
 
-                resp = requests.get(self.DRIVE_FILES_ENDPOINT, params=params, headers=headers or None, timeout=30)
+                resp = session.get(self.DRIVE_FILES_ENDPOINT, params=params, headers=self._headers, timeout=30)
                 if resp.status_code != 200:
                     self._log(f"Drive API returned status {resp.status_code}: {resp.text}")
                     return files
@@ -111,20 +191,14 @@ class ApiFetcher(BaseFetcher):
 
                 for f in page_files:
                     name = f.get('name') or ''
-                    if name.lower().endswith('.xlsm'):
-                        size = 0
-                        try:
-                            size = int(f.get('size', 0) or 0)
-                        except Exception:
-                            size = 0
-
-                        files.append(name)
+                    # the server-side filter may also match names that only contain '.xlsm'
+                    if _XLSM_RE.search(name):
+                        files.append(f)
 
                 next_token = data.get('nextPageToken')
                 if not next_token:
                     break
 
-            self._log(f"API fetch completed. Found {len(files)} .xlsm files")
             return files
 
         except requests.RequestException as e:
@@ -133,3 +207,87 @@ class ApiFetcher(BaseFetcher):
         except Exception as e:
             self._log(f"Unexpected error during API fetch: {e}")
             return files
+
+    def _download_files(self, listed_files: List[Dict], auth_params: Dict[str, str]) -> List[str]:
+        """Download listed files concurrently, at most DOWNLOAD_WORKERS at a time.
+
+        Files are downloaded one by one if concurrency_safe is False.
+        A failed download is logged and skipped without stopping the others.
+
+        Args:
+            listed_files: file entries from _list_files().
+            auth_params: query parameters with credentials.
+
+        Returns:
+            List[str] - names of downloaded files, in listing order
+        """
+        # Files with the same name would overwrite each other, keep the first one
+        unique_files = list({Path(f['name']).name: f for f in reversed(listed_files)}.values())[::-1]
+
+        if not self.concurrency_safe:
+            return [name for name in (self._download_file(f, auth_params) for f in unique_files) if name]
+
+        with ThreadPoolExecutor(max_workers=self.DOWNLOAD_WORKERS) as executor:
+            results = executor.map(lambda f: self._download_file(f, auth_params), unique_files)
+            return [name for name in results if name]
+
+    def _download_file(self, file_entry: Dict, auth_params: Dict[str, str]) -> Optional[str]:
+        """Download a single file into download_dir.
+
+        A local file with the same size and MD5 as in the listing is kept as is.
+        Otherwise the body is streamed in chunks to a temporary file that replaces the target
+        only after the download has completed and its checksum matched.
+
+        Args:
+            file_entry: file entry with 'id', 'name' and optional 'size' and 'md5Checksum'.
+            auth_params: query parameters with credentials.
+
+        Returns:
+            Optional[str] - file name on success, None on failure
+        """
+        # Drive names may contain path separators, keep only the last part
+        name = Path(file_entry['name']).name
+        target = self.download_dir / name
+        part_path = target.with_name(target.name + '.part')
+        expected_md5 = file_entry.get('md5Checksum')
+
+        try:
+            if expected_md5 and self._is_same_file(target, file_entry):
+                self._log(f"Already up to date: {name}")
+                return name
+
+            url = f"{self.DRIVE_FILES_ENDPOINT}/{file_entry['id']}"
+            params = {**auth_params, 'alt': 'media'}
+            md5 = hashlib.md5()
+            # Called from download worker threads, each uses its own session
+            with _get_session().get(url, params=params, headers=self._headers, stream=True, timeout=60) as resp:
+                if resp.status_code != 200:
+                    self._log(f"Failed to download {name}: status {resp.status_code}")
+                    return None
+                with open(part_path, 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                        md5.update(chunk)
+                        f.write(chunk)
+
+            if expected_md5 and md5.hexdigest() != expected_md5:
+                self._log(f"Failed to download {name}: checksum mismatch")
+                part_path.unlink(missing_ok=True)
+                return None
+
+            os.replace(part_path, target)
+            return name
+        except (requests.RequestException, OSError) as e:
+            self._log(f"Failed to download {name}: {e}")
+            part_path.unlink(missing_ok=True)
+            return None
+
+    def _is_same_file(self, path: Path, file_entry: Dict) -> bool:
+        """Check whether a local file matches the listed size and md5Checksum."""
+        try:
+            if str(path.stat().st_size) != file_entry.get('size'):
+                return False
+        except FileNotFoundError:
+            return False
+
+        with open(path, 'rb') as f:
+            return hashlib.file_digest(f, 'md5').hexdigest() == file_entry['md5Checksum']
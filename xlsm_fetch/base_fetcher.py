@@ -1,8 +1,12 @@
 """Base fetcher for xlsm_fetch package."""
 
 from typing import List, Dict, Optional
+from functools import cached_property
 from pathlib import Path
 
+# Project root (parent of the xlsm_fetch package), resolved once at import
+_PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+
 
 class BaseFetcher:
     """Abstract base class for all fetchers in xlsm_fetch.
@@ -14,21 +18,23 @@ class BaseFetcher:
         """Initialize with Google Drive folder URL and optional download directory.
 
         If download_dir is not provided, it is set to <project_root>/xlsm_archive.
+        The directory is resolved and created on first access to self.download_dir.
         """
         self.folder_url = folder_url
 
-        # Normalize: if download_dir not provided, use project_root/xlsm_archive
-        project_root = Path(__file__).parent.parent.resolve()
         # expose project root to subclasses so they can inherit it instead of recomputing
-        self.project_root = project_root
-        if not download_dir:
-            download_dir = str(project_root / 'xlsm_archive')
+        self.project_root = _PROJECT_ROOT
+        self._download_dir_spec = download_dir
 
-        p = Path(download_dir)
+    @cached_property
+    def download_dir(self) -> Path:
+        """Absolute download directory, created if missing."""
+        # Normalize: if download_dir not provided, use project_root/xlsm_archive
+        p = Path(self._download_dir_spec or self.project_root / 'xlsm_archive')
         if not p.is_absolute():
-            p = project_root / p
+            p = self.project_root / p
         p.mkdir(parents=True, exist_ok=True)
-        self.download_dir = p.resolve()
+        return p.resolve()
 
     def fetch(self) -> List[str]:
         """Perform the fetch. Must be implemented by subclasses.
@@ -1,35 +1,263 @@
 """Selenium-based fetcher for Google Drive files."""
 
+import os
+import threading
 import time
-import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 
 from .base_fetcher import BaseFetcher
-import shutil
 from pathlib import Path
 import zipfile
-import tempfile
 import hashlib
+import json
+import zlib
+
+# Cache of CRC32 of existing files in download directory, so unchanged files aren't re-read every run
+CRC_CACHE_FILE = '.xlsm_crc_cache.json'
+
+# Copy buffers reused by extraction threads instead of allocating a new chunk on every read
+_COPY_BUFFER_SIZE = 1024 * 1024
+_copy_buffers = threading.local()
+
+
+def _copy_buffer() -> bytearray:
+    """Return the copy buffer of the current thread."""
+    buf = getattr(_copy_buffers, 'buf', None)
+    if buf is None:
+        buf = _copy_buffers.buf = bytearray(_COPY_BUFFER_SIZE)
+    return buf
+
+
+def file_crc32(path: Path) -> Optional[int]:
+    """Compute CRC32 of a file as stored in zip archives, None if the file can't be read."""
+    crc = 0
+    try:
+        with path.open('rb') as f:
+            while chunk := f.read(1024 * 1024):
+                crc = zlib.crc32(chunk, crc)
+    except OSError:
+        return None
+    return crc
+
+
+# Download button in the toolbar shown for selected files, by aria-label ("Скачать" / "Download")
+_DOWNLOAD_BUTTON_SELECTOR = "[role='button'][aria-label*='кач'], [role='button'][aria-label*='ownload']"
+
+# Returns visible [role='button'] elements in the top-right area (left > min_x, top < max_y)
+# with pointer cursor, blue text color (Google's blue is approximately rgb(11, 87, 208)),
+# focusable (tabindex >= 0 or naturally focusable) and active (not disabled)
+_FIND_DOWNLOAD_BUTTONS_JS = """
+var minX = arguments[0], maxY = arguments[1];
+var focusableTags = ['BUTTON', 'A', 'INPUT', 'SELECT', 'TEXTAREA'];
+var result = [];
+document.querySelectorAll("[role='button']").forEach(function (el) {
+    var r = el.getBoundingClientRect();
+    if (r.width === 0 || r.height === 0) return;
+    if (r.left <= minX || r.top >= maxY) return;
+
+    var styles = window.getComputedStyle(el);
+    if (styles.display === 'none' || styles.visibility === 'hidden') return;
+    if (styles.cursor !== 'pointer') return;
+
+    var m = /^rgb\((\d+),\s*(\d+),\s*(\d+)\)/.exec(styles.color);
+    if (!m) return;
+    var red = +m[1], green = +m[2], blue = +m[3];
+    if (!(blue > red && blue > green && blue > 100)) return;
+
+    var tabindex = el.getAttribute('tabindex');
+    var focusable = (tabindex !== null && parseInt(tabindex, 10) >= 0) || focusableTags.indexOf(el.tagName) >= 0;
+    if (!focusable) return;
+
+    if ((el.getAttribute('aria-disabled') || '').toLowerCase() === 'true' || el.hasAttribute('disabled')) return;
+
+    result.push(el);
+});
+return result;
+"""
+
+# Async script: finds the scrollable container of the file list ([data-id] rows), scrolls it
+# to the bottom until the number of rows stops growing and calls back with
+# {initial, count, steps}, or null if there is no scrollable container
+_SCROLL_FILE_LIST_JS = """
+var done = arguments[arguments.length - 1];
+var maxSteps = 500, stagnationLimit = 20, interval = 500;
+function countItems() { return document.querySelectorAll('[data-id]').length; }
+
+var row = document.querySelector('[data-id]');
+var container = row ? row.parentElement : null;
+while (container && container.scrollHeight <= container.clientHeight) {
+    container = container.parentElement;
+}
+if (!container) { done(null); return; }
+
+var initial = countItems(), count = initial, steps = 0, stagnation = 0;
+(function step() {
+    if (steps >= maxSteps || stagnation >= stagnationLimit) {
+        done({initial: initial, count: count, steps: steps});
+        return;
+    }
+    steps++;
+    container.scrollTop = container.scrollHeight;
+    setTimeout(function () {
+        var newCount = countItems();
+        if (newCount > count) { count = newCount; stagnation = 0; } else { stagnation++; }
+        step();
+    }, interval);
+})();
+"""
+
+# Installs window.__bdParser with diagnostic helpers once per page, so the probe scripts below
+# stay short. probe(el) collects element properties: tag, attributes, position, CSS properties,
+# parent, generated XPath and CSS selector, text content, identification
+# properties and alternative selectors
+_PROBE_BOOTSTRAP_JS = """
+window.__bdParser = (function () {
+    function getAttrs(el) {
+        var result = {};
+        for (var i = 0; i < el.attributes.length; i++) {
+            result[el.attributes[i].name] = el.attributes[i].value;
+        }
+        return result;
+    }
+    // Generated paths by element, probes of the same element don't walk the DOM again
+    var xpathCache = new WeakMap(), cssPathCache = new WeakMap();
+    function memoize(fn, cache) {
+        return function (el) {
+            if (!cache.has(el)) cache.set(el, fn(el));
+            return cache.get(el);
+        };
+    }
+    // 1-based position of an element among its siblings with the same tag,
+    // one pass over parent's element children instead of walking sibling pointers
+    function sameTagIndex(el) {
+        var parent = el.parentNode;
+        if (!parent || !parent.children) return 1;
+        var sibs = parent.children, nth = 1;
+        for (var i = 0; i < sibs.length && sibs[i] !== el; i++) {
+            if (sibs[i].nodeName === el.nodeName) nth++;
+        }
+        return nth;
+    }
+    function getXPath(el) {
+        if (el.id) return 'id("' + el.id + '")';
+        var parts = [];
+        while (el && el.nodeType === 1) {
+            var idx = sameTagIndex(el);
+            parts.unshift(el.nodeName.toLowerCase() + '[' + idx + ']');
+            el = el.parentNode;
+        }
+        return '/' + parts.join('/');
+    }
+    function getCSSPath(el) {
+        if (el.id) return '#' + el.id;
+        var path = [];
+        while (el && el.nodeType === 1) {
+            var selector = el.nodeName.toLowerCase();
+            if (el.className) {
+                selector += '.' + el.className.replace(/\\s+/g, '.');
+            }
+            var nth = sameTagIndex(el);
+            if (nth > 1) selector += ':nth-of-type(' + nth + ')';
+            path.unshift(selector);
+            el = el.parentElement;
+        }
+        return path.join(' > ');
+    }
+    getXPath = memoize(getXPath, xpathCache);
+    getCSSPath = memoize(getCSSPath, cssPathCache);
+    // Long texts are cut in the browser, so only the logged part is sent back
+    function truncate(text) {
+        return text && text.length > 500 ? text.substring(0, 500) + '…' : text;
+    }
+    // Unique characteristics for future identification
+    function uniqueProps(attrs, backgroundColor) {
+        var props = [];
+        ['id', 'class', 'role', 'data-tooltip', 'aria-label'].forEach(function (name) {
+            if (attrs[name]) props.push(name + "='" + attrs[name] + "'");
+        });
+        // Add CSS-based identification
+        if (backgroundColor && backgroundColor !== 'rgba(0, 0, 0, 0)') {
+            props.push('background-color: ' + backgroundColor);
+        }
+        return props;
+    }
+    // Alternative selectors for future use
+    function altSelectors(tag, attrs) {
+        var selectors = [];
+        if (attrs.id) selectors.push('#' + attrs.id);
+        if (attrs['class']) selectors.push(tag + '.' + attrs['class'].split(' ').join('.'));
+        if (attrs.role) selectors.push("[role='" + attrs.role + "']");
+        if (attrs['data-tooltip']) selectors.push("[data-tooltip='" + attrs['data-tooltip'] + "']");
+        return selectors;
+    }
+    function probe(el) {
+        var r = el.getBoundingClientRect();
+        var styles = window.getComputedStyle(el);
+        var parent = el.parentElement;
+        var tag = el.tagName.toLowerCase();
+        var attrs = getAttrs(el);
+        return {
+            tag: tag,
+            attrs: attrs,
+            rect: {top: r.top, left: r.left, width: r.width, height: r.height, right: r.right, bottom: r.bottom},
+            css: {
+                display: styles.display,
+                visibility: styles.visibility,
+                position: styles.position,
+                zIndex: styles.zIndex,
+                backgroundColor: styles.backgroundColor,
+                color: styles.color,
+                fontSize: styles.fontSize,
+                fontFamily: styles.fontFamily,
+                fontWeight: styles.fontWeight,
+                cursor: styles.cursor,
+                border: styles.border,
+                borderRadius: styles.borderRadius,
+                padding: styles.padding,
+                margin: styles.margin
+            },
+            parent: parent ? {tagName: parent.tagName, attributes: getAttrs(parent)} : null,
+            xpath: getXPath(el),
+            cssPath: getCSSPath(el),
+            text: {
+                textContent: truncate(el.textContent),
+                innerHTML: truncate(el.innerHTML),
+                outerHTML: el.outerHTML.substring(0, 500)
+            },
+            uniqueProps: uniqueProps(attrs, styles.backgroundColor),
+            altSelectors: altSelectors(tag, attrs)
+        };
+    }
+    return {probe: probe, xpath: getXPath, cssPath: getCSSPath};
+})();
+"""
+# Probe scripts return null if the helpers are not installed on the page yet
+_PROBE_ELEMENT_JS = "return window.__bdParser ? window.__bdParser.probe(arguments[0]) : null;"
 
 
 class SeleniumFetcher(BaseFetcher):
     """Fetcher that uses Selenium browser automation to get files from Google Drive."""
 
-    def __init__(self, folder_url: str, download_dir: Optional[str] = None, headless: bool = True):
+    def __init__(self, folder_url: str, download_dir: Optional[str] = None, headless: bool = True, debug: bool = False):
         """Initialize with Google Drive folder URL and optional download directory.
 
         Args:
             folder_url: URL of Google Drive folder
             download_dir: optional download directory
             headless: whether to run Chrome in headless mode (default True)
+            debug: log detailed analysis of found page elements (default False)
         """
         super().__init__(folder_url, download_dir)
         self.headless = headless
+        self.debug = debug
 
     def fetch(self) -> List[str]:
         """Fetch list of .xlsm files from Google Drive folder.
@@ -42,40 +270,21 @@ class SeleniumFetcher(BaseFetcher):
         # Use download directory from base class (with fallback logic)
         target_download_dir = self.download_dir
 
-        # Create custom Chrome profile with download settings
+        # Chrome profile is kept between runs, so Chrome reuses its HTTP and code caches for the heavy Drive page
         # Use project_root, set in BaseFetcher
         project_root = self.project_root
-        temp_profile_dir = project_root / "temp_chrome_profile"
-        temp_profile_dir.mkdir(exist_ok=True)
-
-        # Create Preferences file manually
-        preferences_file = temp_profile_dir / "Default" / "Preferences"
-        preferences_file.parent.mkdir(exist_ok=True)
-
-        preferences_data = {
-            "download": {
-                "default_directory": str(target_download_dir.resolve()),
-                "prompt_for_download": False,
-                "directory_upgrade": True
-            }
-        }
-
-        import json
-        with open(preferences_file, 'w', encoding='utf-8') as f:
-            json.dump(preferences_data, f, indent=2)
-
-        self._log(f"Created Chrome profile with download directory: {target_download_dir}")
+        profile_dir = project_root / ".cache" / "chrome_profile"
+        self._log(f"Using Chrome profile: {profile_dir}")
 
         # Setup Chrome options
         chrome_options = ChromeOptions()
-        chrome_options.add_argument(f"--user-data-dir={temp_profile_dir}")
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
 
         # Enable headless mode for CI / unattended runs
         if self.headless:
             try:
                 chrome_options.add_argument("--headless=new")
                 chrome_options.add_argument("--hide-scrollbars")
-                chrome_options.add_argument("--single-process")
             except Exception:
                 # fallback to older headless flag if --headless=new isn't supported
                 try:
@@ -103,17 +312,37 @@ class SeleniumFetcher(BaseFetcher):
             driver = webdriver.Chrome(options=chrome_options)
             driver.set_page_load_timeout(60)
 
+            # Download settings are set at runtime instead of in the profile's Preferences file
+            driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": str(target_download_dir.resolve()),
+            })
+            self._log(f"Download directory: {target_download_dir}")
+
+            if self.debug:
+                # Diagnostic helpers are compiled once per page instead of being sent with every probe
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _PROBE_BOOTSTRAP_JS})
+
             self._log("Opening Google Drive folder...")
             driver.get(self.folder_url)
 
-            self._log("Waiting 60 seconds for page to load...")
-            time.sleep(60)
+            self._log("Waiting up to 60 seconds for page to load...")
+            try:
+                # Continue as soon as the document is loaded and the file list is rendered
+                WebDriverWait(driver, 60, poll_frequency=0.5).until(
+                    lambda d: d.execute_script(
+                        "return document.readyState === 'complete' && "
+                        "document.querySelectorAll('[data-id]').length > 0"))
+                self._log("Page loaded")
+            except TimeoutException:
+                self._log("⚠️ File list did not appear in 60 seconds, continuing anyway")
 
             # Step 1: Scroll through files and select all
             self._scroll_and_select_files(driver)
 
-            # Step 2: Find and click download button
-            download_success = self._find_download_button_by_properties(driver)
+            # Step 2: Find and click download button, by aria-label first and by visual properties if not found
+            download_success = (self._find_download_button_by_label(driver)
+                                or self._find_download_button_by_properties(driver))
             if not download_success:
                 self._log("❌ Failed to find or click download button")
                 return []
@@ -139,13 +368,6 @@ class SeleniumFetcher(BaseFetcher):
             if driver:
                 driver.quit()
 
-            # Cleanup temporary profile
-            if temp_profile_dir.exists():
-                try:
-                    shutil.rmtree(temp_profile_dir)
-                except Exception as cleanup_ex:
-                    self._log(f"Warning: Could not cleanup temp profile: {cleanup_ex}")
-
     def _scroll_and_select_files(self, driver) -> None:
         """Scroll through the file list to load all files and select them all.
 
@@ -154,6 +376,48 @@ class SeleniumFetcher(BaseFetcher):
         """
         self._log("Starting to scroll down (scrolling container)...")
 
+        # Scroll the file list container to the bottom in the browser until no new items appear
+        try:
+            driver.set_script_timeout(300)
+            result = driver.execute_async_script(_SCROLL_FILE_LIST_JS)
+        except Exception as ex:
+            self._log(f"Script scrolling failed: {ex}")
+            result = None
+
+        if result:
+            self._log(f"Script scrolling finished after {result['steps']} steps, "
+                      f"items: {result['initial']} -> {result['count']}")
+        else:
+            # no scrollable container found, fall back to key presses
+            self._scroll_with_keys(driver)
+
+        # Select all files with Ctrl+A
+        try:
+            ActionChains(driver).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
+            self._log('Sent Ctrl+A to select all files')
+        except Exception:
+            try:
+                # fallback: send via ActionChains without key_down/up
+                ActionChains(driver).send_keys(Keys.CONTROL, 'a').perform()
+                self._log('Sent Ctrl+A (fallback)')
+            except Exception:
+                self._log('Failed to send Ctrl+A')
+
+        # wait for the selection to be registered and toolbar to appear
+        try:
+            WebDriverWait(driver, 10, poll_frequency=0.5).until(
+                lambda d: d.execute_script("return document.querySelectorAll('[aria-selected=\"true\"]').length > 0"))
+            # the toolbar is rendered right after the selection changes
+            time.sleep(1)
+        except TimeoutException:
+            self._log("⚠️ Selection was not detected in 10 seconds, continuing anyway")
+
+    def _scroll_with_keys(self, driver) -> None:
+        """Load all files by sending ArrowDown key presses to the file list.
+
+        Args:
+            driver: Selenium WebDriver instance
+        """
         # Send ArrowDown directly to the browser window (no element detection)
         max_presses = 500
         stagnation_limit = 60
@@ -202,20 +466,46 @@ class SeleniumFetcher(BaseFetcher):
 
         self._log(f"Key-scrolling finished after {presses} presses, items={current_count}")
 
-        # Select all files with Ctrl+A
+    def _press_download_button(self, driver, download_button) -> bool:
+        """Focus the download button and press space on it.
+
+        Returns:
+            True if the key press was sent, False otherwise
+        """
+        self._log("\n🖱️ FOCUSING AND PRESSING SPACE ON DOWNLOAD BUTTON...")
         try:
-            ActionChains(driver).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
-            self._log('Sent Ctrl+A to select all files')
-        except Exception:
+            # Focus on the button and press space
+            ActionChains(driver).move_to_element(download_button).perform()
+            time.sleep(1)  # Give time for focus
+            download_button.send_keys(Keys.SPACE)
+            self._log("✅ Download button focused and space pressed successfully")
+            return True
+        except Exception as ex:
+            self._log(f"❌ Error focusing and pressing space on download button: {ex}")
+            return False
+
+    def _find_download_button_by_label(self, driver) -> bool:
+        """Find download button by its aria-label ('Скачать' / 'Download') and click it.
+
+        Returns:
+            True if download button was found and clicked successfully, False otherwise
+        """
+        try:
+            buttons = driver.find_elements(By.CSS_SELECTOR, _DOWNLOAD_BUTTON_SELECTOR)
+        except Exception as ex:
+            self._log(f"❌ Error during aria-label search: {ex}")
+            return False
+
+        self._log(f"Found {len(buttons)} download buttons by aria-label")
+        for button in buttons:
             try:
-                # fallback: send via ActionChains without key_down/up
-                ActionChains(driver).send_keys(Keys.CONTROL, 'a').perform()
-                self._log('Sent Ctrl+A (fallback)')
+                if not button.is_displayed() or not button.is_enabled():
+                    continue
             except Exception:
-                self._log('Failed to send Ctrl+A')
-
-        # wait for the selection to be registered and toolbar to appear
-        time.sleep(10)
+                continue
+            if self._press_download_button(driver, button):
+                return True
+        return False
 
     def _find_download_button_by_properties(self, driver) -> bool:
         """Find download button by combination of properties and click it.
@@ -243,125 +533,23 @@ class SeleniumFetcher(BaseFetcher):
             self._log(f"Screen size: {screen_width}x{screen_height}")
             self._log(f"Top-right quadrant: x > {min_x}, y < {max_y}")
 
-            # Find all elements with role='button'
-            button_elements = driver.find_elements(By.CSS_SELECTOR, "[role='button']")
-            self._log(f"Found {len(button_elements)} elements with role='button'")
-
-            matching_elements = []
-
-            for elem in button_elements:
-                try:
-                    # Check if element is visible and get its properties
-                    if not elem.is_displayed():
-                        continue
-
-                    # Get position
-                    rect = driver.execute_script(
-                        "var r=arguments[0].getBoundingClientRect(); "
-                        "return {top:r.top, left:r.left, width:r.width, height:r.height, "
-                        "right:r.right, bottom:r.bottom};", elem
-                    )
-
-                    # Check if in top-right quadrant
-                    elem_x = rect['left']
-                    elem_y = rect['top']
-
-                    if elem_x <= min_x or elem_y >= max_y:
-                        continue
-
-                    # Get CSS properties
-                    css_props = driver.execute_script(
-                        "var el=arguments[0]; var styles=window.getComputedStyle(el); "
-                        "return {"
-                        "  cursor: styles.cursor, "
-                        "  color: styles.color, "
-                        "  visibility: styles.visibility, "
-                        "  display: styles.display "
-                        "};", elem
-                    )
-
-                    # Check cursor pointer
-                    if css_props.get('cursor') != 'pointer':
-                        continue
-
-                    # Check if element has blue text (RGB values for blue color)
-                    color = css_props.get('color', '')
-                    is_blue = False
-                    if 'rgb(' in color:
-                        # Extract RGB values
-                        rgb_match = re.search(r'rgb\((\d+),\s*(\d+),\s*(\d+)\)', color)
-                        if rgb_match:
-                            r, g, b = map(int, rgb_match.groups())
-                            # Blue text typically has: low red, low green, high blue
-                            # Google's blue is approximately rgb(11, 87, 208)
-                            if b > r and b > g and b > 100:
-                                is_blue = True
-
-                    if not is_blue:
-                        continue
-
-                    # Get attributes for focusability and activity checks
-                    attrs = driver.execute_script(
-                        "var el=arguments[0]; var result={}; "
-                        "for(var i=0; i<el.attributes.length; i++) {"
-                        "  result[el.attributes[i].name] = el.attributes[i].value; "
-                        "} return result;", elem
-                    )
-
-                    # Check if focusable (tabindex >= 0 or naturally focusable)
-                    tabindex = attrs.get('tabindex')
-                    is_focusable = (tabindex is not None and int(tabindex) >= 0) or elem.tag_name.lower() in ['button', 'a', 'input', 'select', 'textarea']
-
-                    if not is_focusable:
-                        continue
-
-                    # Check if active (not disabled)
-                    aria_disabled = attrs.get('aria-disabled', '').lower()
-                    disabled = attrs.get('disabled')
-                    is_active = aria_disabled != 'true' and disabled is None
-
-                    if not is_active:
-                        continue
-
-                    # If all conditions are met, add to matching elements
-                    matching_elements.append({
-                        'element': elem,
-                        'position': rect,
-                        'css_props': css_props,
-                        'attrs': attrs
-                    })
-
-                except Exception as ex:
-                    self._log(f"Error checking element: {ex}")
-                    continue
+            # Filter all elements with role='button' in the browser with one script call
+            # instead of several round-trips per element
+            matching_elements = driver.execute_script(_FIND_DOWNLOAD_BUTTONS_JS, min_x, max_y) or []
 
             self._log(f"✅ Found {len(matching_elements)} elements matching all criteria")
 
-            # Analyze each matching element
-            for i, elem_data in enumerate(matching_elements, start=1):
-                self._log(f"\n--- MATCHING ELEMENT #{i} DETAILED ANALYSIS ---")
-                self._analyze_element_details(driver, elem_data['element'])
-
-            # Click the first matching element if found
-            if matching_elements:
-                download_button = matching_elements[0]['element']
-                self._log("\n🖱️ FOCUSING AND PRESSING SPACE ON DOWNLOAD BUTTON...")
-
-                try:
-                    # Focus on the button and press space
-                    ActionChains(driver).move_to_element(download_button).perform()
-                    time.sleep(1)  # Give time for focus
-                    download_button.send_keys(Keys.SPACE)
-                    self._log("✅ Download button focused and space pressed successfully")
+            # Click the first matching element that accepts the key press
+            for i, download_button in enumerate(matching_elements, start=1):
+                if self.debug:
+                    self._log(f"\n--- MATCHING ELEMENT #{i} DETAILED ANALYSIS ---")
+                self._analyze_element_details(driver, download_button)
 
+                if self._press_download_button(driver, download_button):
                     return True  # Download button found and clicked
 
-                except Exception as ex:
-                    self._log(f"❌ Error focusing and pressing space on download button: {ex}")
-                    return False
-            else:
-                self._log("❌ No suitable download button found to activate")
-                return False
+            self._log("❌ No suitable download button found to activate")
+            return False
 
         except Exception as ex:
             self._log(f"❌ Error during property-based search: {ex}")
@@ -376,52 +564,75 @@ class SeleniumFetcher(BaseFetcher):
         # Get initial files in target download directory
         initial_files = set()
         if target_download_dir.exists():
-            initial_files = set(f.name for f in target_download_dir.iterdir() if f.is_file())
+            with os.scandir(target_download_dir) as it:
+                initial_files = {entry.name for entry in it if entry.is_file()}
         self._log(f"Initial files in target directory: {len(initial_files)}")
 
         max_wait_time = 300  # 5 minutes maximum wait
-        check_interval = 5   # Check every 5 seconds
+        # Check often at first so small archives are picked up quickly, then back off up to 5 seconds
+        check_interval = 0.25
+        max_check_interval = 5.0
+        start_time = time.monotonic()
         elapsed_time = 0
+        # Progress is logged only when it changes, not on every check
+        last_status = None
+
+        def log_status(status: str) -> None:
+            nonlocal last_status
+            if status != last_status:
+                self._log(f"{status} ({elapsed_time}s)")
+                last_status = status
 
         while elapsed_time < max_wait_time:
             time.sleep(check_interval)
-            elapsed_time += check_interval
+            check_interval = min(check_interval * 2, max_check_interval)
+            elapsed_time = round(time.monotonic() - start_time)
 
             if not target_download_dir.exists():
-                self._log(f"Target directory doesn't exist yet, waiting... ({elapsed_time}s)")
+                log_status("Target directory doesn't exist yet, waiting...")
                 continue
 
-            # Get current files in target directory
-            current_files = set(f.name for f in target_download_dir.iterdir() if f.is_file())
-            new_files = current_files - initial_files
-
-            # Check for .crdownload files (Chrome partial downloads)
-            partial_downloads = [f for f in current_files if f.endswith('.crdownload')]
+            # Get new files in target directory and sort out partial downloads and archives in one pass
+            new_files = set()
+            partial_downloads = []
+            new_zip_files = []
+            with os.scandir(target_download_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    # Check for .crdownload files (Chrome partial downloads)
+                    if name.endswith('.crdownload'):
+                        partial_downloads.append(name)
+                    if name in initial_files or not entry.is_file():
+                        continue
+                    new_files.add(name)
+                    if name.lower().endswith('.zip'):
+                        new_zip_files.append(name)
 
             if partial_downloads:
-                self._log(f"📥 Download in progress: {partial_downloads} ({elapsed_time}s)")
+                log_status(f"📥 Download in progress: {partial_downloads}")
                 continue
 
-            # Check for new zip files
-            new_zip_files = [f for f in new_files if f.lower().endswith('.zip')]
-
             if new_zip_files:
                 zip_file = new_zip_files[0]
                 zip_path = target_download_dir / zip_file
 
                 # Verify file is complete and not zero bytes
-                if zip_path.exists() and zip_path.stat().st_size > 0:
+                try:
+                    zip_size = zip_path.stat().st_size
+                except OSError:
+                    zip_size = 0
+                if zip_size > 0:
                     self._log(f"✅ Download completed: {zip_file}")
-                    self._log(f"📦 File size: {zip_path.stat().st_size} bytes")
+                    self._log(f"📦 File size: {zip_size} bytes")
                     return zip_path
                 else:
-                    self._log(f"⚠️ Zip file exists but may be incomplete: {zip_file} ({elapsed_time}s)")
+                    log_status(f"⚠️ Zip file exists but may be incomplete: {zip_file}")
 
             # Check if any new files appeared
             if new_files:
-                self._log(f"📄 New files detected: {new_files} ({elapsed_time}s)")
+                log_status(f"📄 New files detected: {new_files}")
             else:
-                self._log(f"⏳ Still waiting for download... ({elapsed_time}s)")
+                log_status("⏳ Still waiting for download...")
 
         self._log(f"⏰ Download wait timeout after {max_wait_time} seconds")
 
@@ -438,69 +649,95 @@ class SeleniumFetcher(BaseFetcher):
     def _process_downloaded_archive(self, zip_path: Path, target_download_dir: Path) -> List[str]:
         """Unpack downloaded zip, compare its .xlsm files with target directory and copy new/different ones.
 
-        After processing removes the downloaded zip and temporary extraction directory.
+        Files are compared by size and CRC32 from the zip central directory, so unchanged
+        files are neither extracted nor hashed. New and changed files are extracted in parallel
+        straight into the target directory.
+        After processing removes the downloaded zip.
+
+        Args:
+            zip_path: downloaded archive
+            target_download_dir: directory with previously downloaded files
 
         Returns:
             List of new file names added
         """
         self._log(f"📦 Processing downloaded archive: {zip_path}")
 
-        # Create temporary extraction directory
-        tmp_dir = Path(tempfile.mkdtemp(prefix="xlsm_extract_"))
         try:
-            # Extract archive
             try:
                 with zipfile.ZipFile(zip_path, 'r') as zf:
-                    zf.extractall(tmp_dir)
-                self._log(f"✅ Extracted archive to temporary dir: {tmp_dir}")
+                    # Find .xlsm entries in the archive
+                    entries = [info for info in zf.infolist() if not info.is_dir() and info.filename.endswith('.xlsm')]
             except Exception as ex:
-                self._log(f"❌ Failed to extract archive: {ex}")
+                self._log(f"❌ Failed to open archive: {ex}")
                 return []
+            self._log(f"Found {len(entries)} .xlsm files in the archive")
 
-            # Helper to compute SHA256 of a file
-            def file_hash(p: Path) -> str:
-                h = hashlib.sha256()
-                with p.open('rb') as f:
-                    for chunk in iter(lambda: f.read(8192), b''):
-                        h.update(chunk)
-                return h.hexdigest()
-
-            # Gather existing files hashes in target directory
+            # Existing files in target directory by name, and their sizes from the same directory scan
             existing_files = {}
+            existing_sizes = {}
             if target_download_dir.exists():
-                for p in target_download_dir.glob('*.xlsm'):
-                    if p.is_file():
-                        try:
-                            existing_files[p.name] = file_hash(p)
-                        except Exception:
-                            existing_files[p.name] = None
-
-            # Find extracted .xlsm files
-            extracted_files = [p for p in tmp_dir.rglob('*.xlsm') if p.is_file()]
-            self._log(f"Found {len(extracted_files)} extracted .xlsm files")
+                with os.scandir(target_download_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith('.xlsm') and entry.is_file():
+                            existing_files[entry.name] = Path(entry.path)
+                            existing_sizes[entry.name] = entry.stat().st_size
+
+            # CRC32 of existing files from previous runs: name -> [mtime_ns, size, crc]
+            crc_cache_path = target_download_dir / CRC_CACHE_FILE
+            crc_cache = self._load_crc_cache(crc_cache_path)
+
+            # ZipFile objects can't be read from several threads, each worker opens its own
+            local = threading.local()
+            handles = []
+
+            def extract(info: zipfile.ZipInfo) -> Optional[str]:
+                if not hasattr(local, 'zf'):
+                    local.zf = zipfile.ZipFile(zip_path, 'r')
+                    handles.append(local.zf)
+                try:
+                    return self._extract_entry(local.zf, info, target_download_dir,
+                                               Path(info.filename).name in existing_files)
+                except Exception as ex:
+                    self._log(f"❌ Error while handling archive entry {info.filename}: {ex}")
+                    return None
+
+            # Only existing files with the same name and size can be unchanged (files with different
+            # content almost always differ in size), so only those are checksummed. CRC32 is computed
+            # in parallel (zlib, zip decompression and file I/O release the GIL)
+            same_size = [info for info in entries
+                         if existing_sizes.get(Path(info.filename).name) == info.file_size]
+            try:
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    crcs = executor.map(
+                        lambda info: self._cached_crc32(existing_files[Path(info.filename).name], crc_cache), same_size)
+                    unchanged = {id(info) for info, crc in zip(same_size, crcs) if crc == info.CRC}
+
+                    # same name and content -> skip
+                    changed = [info for info in entries if id(info) not in unchanged]
+                    extracted = list(zip(changed, executor.map(extract, changed)))
+            finally:
+                for handle in handles:
+                    handle.close()
 
             added_files = []
-            for ef in extracted_files:
+            for info, name in extracted:
+                if not name:
+                    continue
+                added_files.append(name)
+                # CRC32 of extracted files is known from the archive
                 try:
-                    name = ef.name
-                    h = file_hash(ef)
-
-                    if name in existing_files and existing_files[name] == h:
-                        # same name and content -> skip
-                        continue
+                    st = (target_download_dir / name).stat()
+                    crc_cache[name] = [st.st_mtime_ns, st.st_size, info.CRC]
+                except OSError:
+                    pass
 
-                    # Decide destination path. If name exists but different content -> add hash suffix
-                    if name in existing_files:
-                        dest_name = f"{ef.stem}_{h[:8]}{ef.suffix}"
-                    else:
-                        dest_name = name
+            # Forget files that were removed from target directory
+            known_files = existing_files.keys() | set(added_files)
+            self._save_crc_cache(crc_cache_path, {name: v for name, v in crc_cache.items() if name in known_files})
 
-                    dest_path = Path(target_download_dir) / dest_name
-                    shutil.copy2(ef, dest_path)
-                    added_files.append(dest_path.name)
-                    self._log(f"➕ Added file: {dest_path.name}")
-                except Exception as ex:
-                    self._log(f"❌ Error while handling extracted file {ef}: {ex}")
+            for name in added_files:
+                self._log(f"➕ Added file: {name}")
 
             if not added_files:
                 self._log("ℹ️ No new files to add from the archive")
@@ -517,364 +754,98 @@ class SeleniumFetcher(BaseFetcher):
             except Exception as ex:
                 self._log(f"⚠️ Could not remove archive {zip_path}: {ex}")
 
-            # Cleanup temporary extraction directory
-            try:
-                shutil.rmtree(tmp_dir)
-                self._log(f"🗑️ Removed temporary extraction dir: {tmp_dir}")
-            except Exception as ex:
-                self._log(f"⚠️ Could not remove temp dir {tmp_dir}: {ex}")
+    @staticmethod
+    def _extract_entry(zf: zipfile.ZipFile, info: zipfile.ZipInfo, target_download_dir: Path, name_exists: bool) -> str:
+        """Extract a single archive entry into target directory.
 
-    def _analyze_element_details(self, driver, elem):
-        """Analyze element details (same as before but extracted to separate method)."""
-        try:
-            # Basic properties
-            tag_name = elem.tag_name
-            self._log(f"Tag: {tag_name}")
-
-            # All attributes
-            attrs = driver.execute_script(
-                "var el=arguments[0]; var result={}; "
-                "for(var i=0; i<el.attributes.length; i++) {"
-                "  result[el.attributes[i].name] = el.attributes[i].value; "
-                "} return result;", elem
-            )
-            self._log(f"Attributes: {attrs}")
-
-            # Position and size
-            rect = driver.execute_script(
-                "var r=arguments[0].getBoundingClientRect(); "
-                "return {top:r.top, left:r.left, width:r.width, height:r.height, "
-                "right:r.right, bottom:r.bottom};", elem
-            )
-            self._log(f"Position: {rect}")
-
-            # CSS properties
-            css_props = driver.execute_script(
-                "var el=arguments[0]; var styles=window.getComputedStyle(el); "
-                "return {"
-                "  display: styles.display, "
-                "  visibility: styles.visibility, "
-                "  position: styles.position, "
-                "  zIndex: styles.zIndex, "
-                "  backgroundColor: styles.backgroundColor, "
-                "  color: styles.color, "
-                "  fontSize: styles.fontSize, "
-                "  fontFamily: styles.fontFamily, "
-                "  fontWeight: styles.fontWeight, "
-                "  cursor: styles.cursor, "
-                "  border: styles.border, "
-                "  borderRadius: styles.borderRadius, "
-                "  padding: styles.padding, "
-                "  margin: styles.margin "
-                "};", elem
-            )
-            self._log(f"CSS Properties: {css_props}")
-
-            # Parent element info
-            parent_info = driver.execute_script(
-                "var el=arguments[0].parentElement; "
-                "if(!el) return null; "
-                "var attrs={}; "
-                "for(var i=0; i<el.attributes.length; i++) {"
-                "  attrs[el.attributes[i].name] = el.attributes[i].value; "
-                "} "
-                "return {tagName: el.tagName, attributes: attrs};", elem
-            )
-            self._log(f"Parent: {parent_info}")
-
-            # XPath generation
-            xpath = driver.execute_script(
-                "function getXPath(el) {"
-                "  if(el.id) return 'id(\"' + el.id + '\")'; "
-                "  var parts = []; "
-                "  while(el && el.nodeType === 1) {"
-                "    var nb = 0; "
-                "    var sib = el.previousSibling; "
-                "    while(sib) {"
-                "      if(sib.nodeType === 1 && sib.nodeName === el.nodeName) nb++; "
-                "      sib = sib.previousSibling; "
-                "    } "
-                "    var idx = nb ? nb + 1 : 1; "
-                "    parts.unshift(el.nodeName.toLowerCase() + '[' + idx + ']'); "
-                "    el = el.parentNode; "
-                "  } "
-                "  return '/' + parts.join('/'); "
-                "} "
-                "return getXPath(arguments[0]);", elem
-            )
-            self._log(f"Generated XPath: {xpath}")
-
-            # CSS Selector generation
-            css_selector = driver.execute_script(
-                "function getCSSPath(el) {"
-                "  if(el.id) return '#' + el.id; "
-                "  var path = []; "
-                "  while(el && el.nodeType === 1) {"
-                "    var selector = el.nodeName.toLowerCase(); "
-                "    if(el.className) {"
-                "      selector += '.' + el.className.replace(/\\s+/g, '.'); "
-                "    } "
-                "    var sib = el.previousElementSibling; "
-                "    var nth = 1; "
-                "    while(sib) {"
-                "      if(sib.nodeName.toLowerCase() === selector.split('.')[0]) nth++; "
-                "      sib = sib.previousElementSibling; "
-                "    } "
-                "    if(nth > 1) selector += ':nth-of-type(' + nth + ')'; "
-                "    path.unshift(selector); "
-                "    el = el.parentElement; "
-                "  } "
-                "  return path.join(' > '); "
-                "} "
-                "return getCSSPath(arguments[0]);", elem
-            )
-            self._log(f"Generated CSS Selector: {css_selector}")
-
-            # Event listeners info
-            events_info = driver.execute_script(
-                "var el=arguments[0]; "
-                "return {"
-                "  onclick: el.onclick ? 'present' : 'none', "
-                "  hasEventListeners: typeof el._eventListeners !== 'undefined' ? 'possible' : 'unknown' "
-                "};", elem
-            )
-            self._log(f"Event Handlers: {events_info}")
-
-            # Text content variations
-            text_info = driver.execute_script(
-                "var el=arguments[0]; "
-                "return {"
-                "  textContent: el.textContent, "
-                "  innerText: el.innerText, "
-                "  innerHTML: el.innerHTML, "
-                "  outerHTML: el.outerHTML.substring(0, 500) "
-                "};", elem
-            )
-            self._log(f"Text Content: {text_info['textContent']}")
-            self._log(f"Inner Text: {text_info['innerText']}")
-            self._log(f"Inner HTML: {text_info['innerHTML']}")
-            self._log(f"Outer HTML (first 500 chars): {text_info['outerHTML']}")
-
-            # Unique characteristics for future identification
-            unique_props = []
-
-            if attrs.get('id'):
-                unique_props.append(f"id='{attrs['id']}'")
-            if attrs.get('class'):
-                unique_props.append(f"class='{attrs['class']}'")
-            if attrs.get('role'):
-                unique_props.append(f"role='{attrs['role']}'")
-            if attrs.get('data-tooltip'):
-                unique_props.append(f"data-tooltip='{attrs['data-tooltip']}'")
-            if attrs.get('aria-label'):
-                unique_props.append(f"aria-label='{attrs['aria-label']}'")
-
-            # Add CSS-based identification
-            if css_props.get('backgroundColor') and css_props['backgroundColor'] != 'rgba(0, 0, 0, 0)':
-                unique_props.append(f"background-color: {css_props['backgroundColor']}")
-
-            self._log(f"🎯 UNIQUE IDENTIFICATION PROPERTIES: {unique_props}")
-
-            # Alternative selectors for future use
-            alt_selectors = []
-            if attrs.get('id'):
-                alt_selectors.append(f"#{attrs['id']}")
-            if attrs.get('class'):
-                classes = attrs['class'].replace(' ', '.')
-                alt_selectors.append(f"{tag_name}.{classes}")
-            if attrs.get('role'):
-                alt_selectors.append(f"[role='{attrs['role']}']")
-            if attrs.get('data-tooltip'):
-                alt_selectors.append(f"[data-tooltip='{attrs['data-tooltip']}']")
-
-            self._log(f"🔍 ALTERNATIVE SELECTORS: {alt_selectors}")
-
-        except Exception as ex:
-            self._log(f"❌ Error analyzing element: {ex}")
+        The entry is written to a temporary file first and renamed when complete.
+        If a file with the same name exists (with different content), a hash suffix is added to the name.
 
-    def _analyze_download_button(self, driver):
-        """Find and analyze 'Скачать все' button with detailed property extraction."""
-        self._log("=== ANALYZING DOWNLOAD BUTTON ===")
-
-        # Find element with exact text 'Скачать все'
+        Returns:
+            Name of the added file
+        """
+        entry_name = Path(info.filename)
+        part_path = target_download_dir / f"{entry_name.name}.{threading.get_ident()}.part"
+        h = hashlib.sha256()
+        buf = _copy_buffer()
+        view = memoryview(buf)
         try:
-            xpath_exact = "//*[normalize-space(string())='Скачать все']"
-            elements = driver.find_elements(By.XPATH, xpath_exact)
-
-            if not elements:
-                self._log("❌ No element with exact text 'Скачать все' found")
-                return
-
-            self._log(f"✅ Found {len(elements)} element(s) with exact text 'Скачать все'")
+            with zf.open(info) as src, part_path.open('wb') as dst:
+                while n := src.readinto(buf):
+                    h.update(view[:n])
+                    dst.write(view[:n])
+
+            # Decide destination path. If name exists but different content -> add hash suffix
+            if name_exists:
+                dest_name = f"{entry_name.stem}_{h.hexdigest()[:8]}{entry_name.suffix}"
+            else:
+                dest_name = entry_name.name
+            os.replace(part_path, target_download_dir / dest_name)
+            return dest_name
+        finally:
+            part_path.unlink(missing_ok=True)
 
-            for i, elem in enumerate(elements, start=1):
-                self._log(f"\n--- ELEMENT #{i} DETAILED ANALYSIS ---")
+    @staticmethod
+    def _cached_crc32(path: Path, crc_cache: Dict[str, list]) -> Optional[int]:
+        """Return CRC32 of a file from cache if its mtime and size didn't change, otherwise compute and cache it."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        cached = crc_cache.get(path.name)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        crc = file_crc32(path)
+        if crc is not None:
+            crc_cache[path.name] = [st.st_mtime_ns, st.st_size, crc]
+        return crc
+
+    def _load_crc_cache(self, path: Path) -> Dict[str, list]:
+        """Load CRC32 cache of target directory files, empty if missing or broken."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            self._log(f"⚠️ Ignoring broken CRC cache {path}: {ex}")
+            return {}
+
+    def _save_crc_cache(self, path: Path, cache: Dict[str, list]) -> None:
+        """Save CRC32 cache of target directory files."""
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            self._log(f"⚠️ Could not save CRC cache {path}: {ex}")
 
-                try:
-                    # Basic properties
-                    tag_name = elem.tag_name
-                    self._log(f"Tag: {tag_name}")
-
-                    # All attributes
-                    attrs = driver.execute_script(
-                        "var el=arguments[0]; var result={}; "
-                        "for(var i=0; i<el.attributes.length; i++) {"
-                        "  result[el.attributes[i].name] = el.attributes[i].value; "
-                        "} return result;", elem
-                    )
-                    self._log(f"Attributes: {attrs}")
-
-                    # Position and size
-                    rect = driver.execute_script(
-                        "var r=arguments[0].getBoundingClientRect(); "
-                        "return {top:r.top, left:r.left, width:r.width, height:r.height, "
-                        "right:r.right, bottom:r.bottom};", elem
-                    )
-                    self._log(f"Position: {rect}")
-
-                    # CSS properties
-                    css_props = driver.execute_script(
-                        "var el=arguments[0]; var styles=window.getComputedStyle(el); "
-                        "return {"
-                        "  display: styles.display, "
-                        "  visibility: styles.visibility, "
-                        "  position: styles.position, "
-                        "  zIndex: styles.zIndex, "
-                        "  backgroundColor: styles.backgroundColor, "
-                        "  color: styles.color, "
-                        "  fontSize: styles.fontSize, "
-                        "  fontFamily: styles.fontFamily, "
-                        "  fontWeight: styles.fontWeight, "
-                        "  cursor: styles.cursor, "
-                        "  border: styles.border, "
-                        "  borderRadius: styles.borderRadius, "
-                        "  padding: styles.padding, "
-                        "  margin: styles.margin "
-                        "};", elem
-                    )
-                    self._log(f"CSS Properties: {css_props}")
-
-                    # Parent element info
-                    parent_info = driver.execute_script(
-                        "var el=arguments[0].parentElement; "
-                        "if(!el) return null; "
-                        "var attrs={}; "
-                        "for(var i=0; i<el.attributes.length; i++) {"
-                        "  attrs[el.attributes[i].name] = el.attributes[i].value; "
-                        "} "
-                        "return {tagName: el.tagName, attributes: attrs};", elem
-                    )
-                    self._log(f"Parent: {parent_info}")
-
-                    # XPath generation
-                    xpath = driver.execute_script(
-                        "function getXPath(el) {"
-                        "  if(el.id) return 'id(\"' + el.id + '\")'; "
-                        "  var parts = []; "
-                        "  while(el && el.nodeType === 1) {"
-                        "    var nb = 0; "
-                        "    var sib = el.previousSibling; "
-                        "    while(sib) {"
-                        "      if(sib.nodeType === 1 && sib.nodeName === el.nodeName) nb++; "
-                        "      sib = sib.previousSibling; "
-                        "    } "
-                        "    var idx = nb ? nb + 1 : 1; "
-                        "    parts.unshift(el.nodeName.toLowerCase() + '[' + idx + ']'); "
-                        "    el = el.parentNode; "
-                        "  } "
-                        "  return '/' + parts.join('/'); "
-                        "} "
-                        "return getXPath(arguments[0]);", elem
-                    )
-                    self._log(f"Generated XPath: {xpath}")
-
-                    # CSS Selector generation
-                    css_selector = driver.execute_script(
-                        "function getCSSPath(el) {"
-                        "  if(el.id) return '#' + el.id; "
-                        "  var path = []; "
-                        "  while(el && el.nodeType === 1) {"
-                        "    var selector = el.nodeName.toLowerCase(); "
-                        "    if(el.className) {"
-                        "      selector += '.' + el.className.replace(/\\s+/g, '.'); "
-                        "    } "
-                        "    var sib = el.previousElementSibling; "
-                        "    var nth = 1; "
-                        "    while(sib) {"
-                        "      if(sib.nodeName.toLowerCase() === selector.split('.')[0]) nth++; "
-                        "      sib = sib.previousElementSibling; "
-                        "    } "
-                        "    if(nth > 1) selector += ':nth-of-type(' + nth + ')'; "
-                        "    path.unshift(selector); "
-                        "    el = el.parentElement; "
-                        "  } "
-                        "  return path.join(' > '); "
-                        "} "
-                        "return getCSSPath(arguments[0]);", elem
-                    )
-                    self._log(f"Generated CSS Selector: {css_selector}")
-
-                    # Event listeners info
-                    events_info = driver.execute_script(
-                        "var el=arguments[0]; "
-                        "return {"
-                        "  onclick: el.onclick ? 'present' : 'none', "
-                        "  hasEventListeners: typeof el._eventListeners !== 'undefined' ? 'possible' : 'unknown' "
-                        "};", elem
-                    )
-                    self._log(f"Event Handlers: {events_info}")
-
-                    # Text content variations
-                    text_info = driver.execute_script(
-                        "var el=arguments[0]; "
-                        "return {"
-                        "  textContent: el.textContent, "
-                        "  innerText: el.innerText, "
-                        "  innerHTML: el.innerHTML, "
-                        "  outerHTML: el.outerHTML.substring(0, 500) "
-                        "};", elem
-                    )
-                    self._log(f"Text Content: {text_info['textContent']}")
-                    self._log(f"Inner Text: {text_info['innerText']}")
-                    self._log(f"Inner HTML: {text_info['innerHTML']}")
-                    self._log(f"Outer HTML (first 500 chars): {text_info['outerHTML']}")
-
-                    # Unique characteristics for future identification
-                    unique_props = []
-
-                    if attrs.get('id'):
-                        unique_props.append(f"id='{attrs['id']}'")
-                    if attrs.get('class'):
-                        unique_props.append(f"class='{attrs['class']}'")
-                    if attrs.get('role'):
-                        unique_props.append(f"role='{attrs['role']}'")
-                    if attrs.get('data-tooltip'):
-                        unique_props.append(f"data-tooltip='{attrs['data-tooltip']}'")
-                    if attrs.get('aria-label'):
-                        unique_props.append(f"aria-label='{attrs['aria-label']}'")
-
-                    # Add CSS-based identification
-                    if css_props.get('backgroundColor') and css_props['backgroundColor'] != 'rgba(0, 0, 0, 0)':
-                        unique_props.append(f"background-color: {css_props['backgroundColor']}")
-
-                    self._log(f"🎯 UNIQUE IDENTIFICATION PROPERTIES: {unique_props}")
-
-                    # Alternative selectors for future use
-                    alt_selectors = []
-                    if attrs.get('id'):
-                        alt_selectors.append(f"#{attrs['id']}")
-                    if attrs.get('class'):
-                        classes = attrs['class'].replace(' ', '.')
-                        alt_selectors.append(f"{tag_name}.{classes}")
-                    if attrs.get('role'):
-                        alt_selectors.append(f"[role='{attrs['role']}']")
-                    if attrs.get('data-tooltip'):
-                        alt_selectors.append(f"[data-tooltip='{attrs['data-tooltip']}']")
-
-                    self._log(f"🔍 ALTERNATIVE SELECTORS: {alt_selectors}")
+    def _analyze_element_details(self, driver, elem):
+        """Analyze element details (same as before but extracted to separate method).
 
-                except Exception as ex:
-                    self._log(f"❌ Error analyzing element #{i}: {ex}")
+        Diagnostics only, does nothing unless debug is enabled.
+        """
+        if not self.debug:
+            return
 
+        try:
+            # All properties are read in the browser with one script call
+            report = self._execute_probe(driver, _PROBE_ELEMENT_JS, elem)
+            self._log_element_report(report)
         except Exception as ex:
-            self._log(f"❌ Error during download button analysis: {ex}")
+            self._log(f"❌ Error analyzing element: {ex}")
+
+    @staticmethod
+    def _execute_probe(driver, script: str, *args):
+        """Run a probe script, installing the diagnostic helpers on the page first if needed."""
+        result = driver.execute_script(script, *args)
+        if result is None:
+            driver.execute_script(_PROBE_BOOTSTRAP_JS)
+            result = driver.execute_script(script, *args)
+        return result
+
+    def _log_element_report(self, report: Dict) -> None:
+        """Log element properties collected by _PROBE_ELEMENT_JS as one JSON document."""
+        # One formatted write per element instead of a log line per property
+        self._log(json.dumps(report, ensure_ascii=False, indent=2, default=str))